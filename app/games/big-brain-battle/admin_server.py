@@ -0,0 +1,247 @@
+"""
+Embedded admin HTTP server for the BigBrain Battle bot
+
+    GET /status                      in-flight games, head lag, queue depths
+    GET /profile?seconds=10          sampling profile in collapsed (flamegraph) format
+    GET /trace                       per-RPC-method timings
+    GET /trace?enable=1|0            turn RPC timing traces on or off
+    GET /trace?reset=1               clear collected timings
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from game_ledger import STATE_NAMES
+
+MAX_PROFILE_SECONDS = 120
+
+
+class RpcTracer:
+    """Web3 middleware that times every JSON-RPC call per method while enabled"""
+
+    def __init__(self, recent=200):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}  # method -> [count, total seconds, max seconds, errors]
+        self._recent = deque(maxlen=recent)
+
+    def middleware(self, make_request, w3):
+        def tracer_middleware(method, params):
+            if not self.enabled:
+                return make_request(method, params)
+
+            start = time.perf_counter()
+            failed = False
+            try:
+                response = make_request(method, params)
+                failed = isinstance(response, dict) and "error" in response
+                return response
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self._record(method, time.perf_counter() - start, failed)
+
+        return tracer_middleware
+
+    def _record(self, method, elapsed, failed):
+        with self._lock:
+            stats = self._stats.setdefault(method, [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            stats[3] += failed
+            self._recent.append((time.time(), method, round(elapsed * 1000, 2), failed))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+
+    def snapshot(self):
+        with self._lock:
+            methods = {
+                method: {
+                    "calls": count,
+                    "mean_ms": round(total / count * 1000, 2),
+                    "max_ms": round(worst * 1000, 2),
+                    "errors": errors,
+                }
+                for method, (count, total, worst, errors) in self._stats.items()
+            }
+            recent = [
+                {"at": at, "method": method, "ms": ms, "error": failed}
+                for at, method, ms, failed in self._recent
+            ]
+        return {"enabled": self.enabled, "methods": methods, "recent": recent}
+
+
+def sample_stacks(seconds, interval=0.005, skip_thread=None):
+    """
+    Sample every thread's Python stack for `seconds` and aggregate them into
+    collapsed-stack counts ("outer;inner;leaf" -> samples), ready for flamegraph.pl
+    """
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    counts = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip_thread:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = code.co_filename.rsplit("/", 1)[-1]
+                stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+class _AdminHandler(BaseHTTPRequestHandler):
+    server_version = "BigBrainBotAdmin/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Keep the bot's stdout for the bot
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        admin = self.server.admin
+
+        try:
+            if url.path == "/status":
+                self._send(200, json.dumps(admin.status(), indent=2, default=str))
+            elif url.path == "/profile":
+                seconds = min(float(query.get("seconds", 10)), MAX_PROFILE_SECONDS)
+                interval = max(float(query.get("interval", 0.005)), 0.001)
+                counts = sample_stacks(seconds, interval, skip_thread=threading.get_ident())
+                body = "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+                self._send(200, body + "\n", "text/plain; charset=utf-8")
+            elif url.path == "/trace":
+                tracer = admin.bot.rpc_tracer
+                if "enable" in query:
+                    tracer.enabled = query["enable"] not in ("0", "false", "off")
+                if "reset" in query:
+                    tracer.reset()
+                self._send(200, json.dumps(tracer.snapshot(), indent=2))
+            else:
+                self._send(404, json.dumps({"error": "unknown endpoint", "endpoints": ["/status", "/profile", "/trace"]}))
+        except ValueError as e:
+            self._send(400, json.dumps({"error": str(e)}))
+        except Exception as e:
+            # e.g. a snapshot racing the main loop; answer rather than drop the connection
+            self._send(500, json.dumps({"error": f"{type(e).__name__}: {e}"}))
+
+
+class AdminServer:
+    """Serves bot introspection on a daemon thread; never blocks the event loop"""
+
+    def __init__(self, bot, host="127.0.0.1", port=8765):
+        self.bot = bot
+        self.started_at = time.time()
+        self._httpd = ThreadingHTTPServer((host, port), _AdminHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.admin = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="admin-server", daemon=True)
+
+    @property
+    def address(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def status(self):
+        bot = self.bot
+        now = time.monotonic()
+        arenas = list(bot.arenas.values())
+        games = [
+            {
+                "arena": arena.address,
+                "gameId": record.game_id,
+                "stage": STATE_NAMES[record.state],
+                "block": record.block_number,
+                "gameType": record.game_type,
+                "outcome": record.outcome,
+                "ageSeconds": round(now - record.created_at, 1),
+                "txHash": "0x" + record.tx_hash.hex() if record.tx_hash else None,
+            }
+            for arena in arenas
+            for record in arena.ledger.in_flight()
+        ]
+        ledger_states = Counter()
+        for arena in arenas:
+            ledger_states.update(arena.ledger.state_counts())
+        activity, since = bot.activity
+        head = bot.chain_head
+        cursor = bot.cursor_block
+        return {
+            "uptimeSeconds": round(time.time() - self.started_at, 1),
+            "activity": activity,
+            "draining": bot.drain.requested,
+            "activitySeconds": round(now - since, 2),
+            "chainHead": head,
+            "cursorBlock": cursor,
+            "headLag": head - cursor if head is not None and cursor is not None else None,
+            "inFlight": games,
+            "queues": {
+                "ledger": sum(len(arena.ledger) for arena in arenas),
+                "ledgerStates": dict(ledger_states),
+                "retry": sum(len(arena.retry_queue) for arena in arenas),
+                "deadLetters": sum(len(arena.retry_queue.dead_letters()) for arena in arenas),
+                "reorgWatchedBlocks": len(bot.reorg_tracker),
+            },
+            "arenas": {
+                arena.address: {
+                    "poolBalance": arena.pool_balance,
+                    "quotes": {
+                        "hits": arena.quotes.hits,
+                        "misses": arena.quotes.misses,
+                        "refreshes": arena.quotes.refreshes,
+                        "driftDetected": arena.quotes.drift_detected,
+                    },
+                    "ledger": len(arena.ledger),
+                    "retry": len(arena.retry_queue),
+                }
+                for arena in arenas
+            },
+            "rpc": {
+                "unitsSpent": bot.rpc_budget.units_spent,
+                "secondsThrottled": round(bot.rpc_budget.seconds_throttled, 2),
+                "calls": dict(bot.rpc_budget.calls),
+                "backingOff": bot.rpc_budget.backoff.failing_methods(),
+                "pollInterval": round(bot.poll_interval.interval, 2),
+                "logFilter": {
+                    "syncedBlock": bot.log_filter.synced_block,
+                    "reinstalls": bot.log_filter.reinstalls,
+                    "backfilledBlocks": bot.log_filter.backfilled_blocks,
+                } if bot.log_filter is not None else None,
+                "preflight": {
+                    "batches": bot.preflight.batches,
+                    "simulated": bot.preflight.simulated,
+                    "stateOverrides": bot.preflight.supports_overrides,
+                },
+            },
+        }
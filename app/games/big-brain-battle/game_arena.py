@@ -0,0 +1,51 @@
+"""
+Per-contract state for a BigBrain Battle bot serving several game deployments
+Each arena owns its contract handle, reward pool reading, reward quotes, optional
+odds and message overrides, and the game bookkeeping keyed by that contract's gameIds
+"""
+
+import os
+
+from game_journal import GameJournal
+from game_ledger import GameLedger
+from retry_queue import RetryQueue
+from reward_quotes import RewardQuoteEngine
+
+
+def arena_path(path, address, shared):
+    """Give each arena its own state file when several share one process"""
+    if not path or not shared:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{address[2:10].lower()}{ext}"
+
+
+class GameArena:
+    """One game contract deployment; gameIds are only unique within an arena"""
+
+    def __init__(self, address, contract, max_retries_per_poll=2, dead_letter_path=None,
+                 journal_path=None, win_rates=None, messages=None):
+        self.address = address
+        self.contract = contract
+        # None falls back to the bot's own odds table / message set
+        self.win_rates = win_rates
+        self.messages = messages
+        self.pool_balance = None
+        self.pool_checked_at = 0.0
+        # Local calculatePotentialReward, loaded on first use
+        self.quotes = RewardQuoteEngine(contract)
+
+        self.ledger = GameLedger()
+        self.retry_queue = RetryQueue(
+            max_retries_per_poll=max_retries_per_poll,
+            dead_letter_path=dead_letter_path,
+        )
+        self.journal = GameJournal(journal_path) if journal_path else None
+
+    @property
+    def label(self):
+        return f"{self.address[:10]}…"
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Append-only binary journal of game lifecycles for the BigBrain Battle bot
+Fixed-size records plus an interned AI message table, written in bulk and read
+back through a memory map for zero-copy scans
+
+Usage: python game_journal.py <journal.bin>   # prints summary stats
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for to_numpy()
+    np = None
+
+MAGIC = b"BBBJRNL1"
+HEADER = struct.Struct("<8sI")  # magic, record size
+
+# gameId, detected block, confirmed block, burned (gwei), reward (gwei), gas price (wei),
+# gas used, message id, game type, outcome, status, failure code, tx hash,
+# detected at (unix seconds), detect->send ms, send->confirm ms
+RECORD = struct.Struct("<QQQQQQIIBbBB32sdII")
+
+STATUS_COMPLETED = 0
+STATUS_FAILED = 1
+STATUS_NAMES = ["COMPLETED", "FAILED"]
+
+FAILURE_CODES = ["", "pool_empty", "already_completed", "nonce", "fee", "rpc_transient",
+                 "reorged", "reverted", "unknown"]
+
+GWEI = 10**9
+NO_MESSAGE = 0xFFFFFFFF
+
+FIELDS = ("game_id", "detected_block", "confirmed_block", "burned_gwei", "reward_gwei",
+          "gas_price", "gas_used", "message_id", "game_type", "outcome", "status",
+          "failure_code", "tx_hash", "detected_at", "send_ms", "confirm_ms")
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([
+        ("game_id", "<u8"), ("detected_block", "<u8"), ("confirmed_block", "<u8"),
+        ("burned_gwei", "<u8"), ("reward_gwei", "<u8"), ("gas_price", "<u8"),
+        ("gas_used", "<u4"), ("message_id", "<u4"), ("game_type", "u1"), ("outcome", "i1"),
+        ("status", "u1"), ("failure_code", "u1"), ("tx_hash", "S32"),
+        ("detected_at", "<f8"), ("send_ms", "<u4"), ("confirm_ms", "<u4"),
+    ])
+    assert RECORD_DTYPE.itemsize == RECORD.size
+
+
+def _message_path(path):
+    return path + ".msgs"
+
+
+class GameJournal:
+    """Buffered appender; records hit disk every `flush_every` games or `flush_interval` seconds"""
+
+    def __init__(self, path, flush_every=256, flush_interval=5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+        self._file = open(path, "ab")
+        self._repair(path)
+
+        # Message table: u32 length + utf-8 bytes per entry, id = position in the table
+        messages, valid_size = _read_message_table(path)
+        self._messages = {text: i for i, text in enumerate(messages)}
+        self._message_file = open(_message_path(path), "ab")
+        # Drop a torn last entry so the next message gets the id readers will see
+        self._message_file.truncate(valid_size)
+
+    def _repair(self, path):
+        """
+        Validate the header and cut a torn trailing record from a crash mid-write;
+        appending after it would shift every later record off its boundary
+        """
+        size = os.path.getsize(path)
+        if size < HEADER.size:
+            # Empty, or the header itself was torn: start the journal over
+            self._file.truncate(0)
+            self._file.write(HEADER.pack(MAGIC, RECORD.size))
+            self._file.flush()
+            return
+        with open(path, "rb") as f:
+            magic, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or record_size != RECORD.size:
+            self._file.close()
+            raise ValueError(f"{path} has an unsupported journal format")
+        self._file.truncate(HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size)
+
+    def intern(self, text):
+        """Return the table id for a message, appending it on first use"""
+        if text is None:
+            return NO_MESSAGE
+        message_id = self._messages.get(text)
+        if message_id is None:
+            message_id = len(self._messages)
+            self._messages[text] = message_id
+            data = text.encode("utf-8")
+            self._message_file.write(struct.pack("<I", len(data)) + data)
+            self._message_file.flush()
+        return message_id
+
+    def append(self, game_id, status, detected_block=0, confirmed_block=0, burned_amount=0,
+               reward=0, gas_price=0, gas_used=0, message=None, game_type=0, outcome=-1,
+               failure_class="", tx_hash=b"", detected_at=0.0, send_ms=0, confirm_ms=0):
+        """Buffer one finished game; amounts are in wei and stored as gwei"""
+        self._buffer += RECORD.pack(
+            game_id,
+            detected_block or 0,
+            confirmed_block or 0,
+            (burned_amount or 0) // GWEI,
+            (reward or 0) // GWEI,
+            gas_price or 0,
+            gas_used or 0,
+            self.intern(message),
+            game_type or 0,
+            outcome,
+            status,
+            FAILURE_CODES.index(failure_class) if failure_class in FAILURE_CODES else len(FAILURE_CODES) - 1,
+            bytes(tx_hash or b""),
+            detected_at,
+            int(send_ms),
+            int(confirm_ms),
+        )
+        self._pending += 1
+
+        if self._pending >= self.flush_every:
+            self.flush()
+        else:
+            self.maybe_flush()
+
+    def maybe_flush(self):
+        """Flush if `flush_interval` has passed; call it periodically so a quiet spell can't strand records"""
+        if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+            self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._message_file.close()
+
+
+def _read_message_table(path):
+    """(messages, bytes of whole entries); a torn last entry from a crash is left out"""
+    messages = []
+    message_path = _message_path(path)
+    if not os.path.exists(message_path):
+        return messages, 0
+    with open(message_path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + 4 <= len(data):
+        (length,) = struct.unpack_from("<I", data, offset)
+        end = offset + 4 + length
+        if end > len(data):
+            break
+        messages.append(data[offset + 4:end].decode("utf-8"))
+        offset = end
+    return messages, offset
+
+
+def read_messages(path):
+    """Load the interned message table that belongs to a journal"""
+    return _read_message_table(path)[0]
+
+
+class JournalReader:
+    """Memory-maps a journal; scans slice the map directly instead of copying records"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"{path} is not a game journal")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"{path} has an unsupported journal format")
+        # Ignore a torn trailing record from a crash mid-write
+        self.count = (size - HEADER.size) // RECORD.size
+        self._view = memoryview(self._map)[HEADER.size:HEADER.size + self.count * RECORD.size]
+        self._messages = None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def messages(self):
+        if self._messages is None:
+            self._messages = read_messages(self.path)
+        return self._messages
+
+    def scan(self):
+        """Yield raw record tuples (see FIELDS) straight out of the map"""
+        return RECORD.iter_unpack(self._view)
+
+    def records(self):
+        """Yield records as dicts, with the message text resolved"""
+        messages = self.messages
+        for values in self.scan():
+            record = dict(zip(FIELDS, values))
+            message_id = record["message_id"]
+            record["message"] = messages[message_id] if message_id < len(messages) else None
+            yield record
+
+    def to_numpy(self):
+        """Zero-copy structured array view over all records"""
+        if np is None:
+            raise RuntimeError("numpy is required for JournalReader.to_numpy()")
+        return np.frombuffer(self._view, dtype=RECORD_DTYPE, count=self.count)
+
+    def stats(self):
+        """Aggregate counts and latencies over the whole journal"""
+        if np is not None and self.count:
+            return self._stats_numpy()
+
+        summary = {"games": self.count, "by_status": {}, "by_outcome": {},
+                   "burned_bbt": 0.0, "rewards_avax": 0.0, "mean_confirm_ms": 0.0}
+        confirm_total = 0
+        confirmed = 0
+        for values in self.scan():
+            status = STATUS_NAMES[values[10]]
+            summary["by_status"][status] = summary["by_status"].get(status, 0) + 1
+            if values[10] == STATUS_COMPLETED:
+                summary["by_outcome"][values[9]] = summary["by_outcome"].get(values[9], 0) + 1
+                summary["rewards_avax"] += values[4] / GWEI
+                confirm_total += values[15]
+                confirmed += 1
+            summary["burned_bbt"] += values[3] / GWEI
+        if confirmed:
+            summary["mean_confirm_ms"] = confirm_total / confirmed
+        return summary
+
+    def _stats_numpy(self):
+        records = self.to_numpy()
+        is_completed = records["status"] == STATUS_COMPLETED
+        completed_count = int(is_completed.sum())
+        status_counts = np.bincount(records["status"], minlength=len(STATUS_NAMES))
+        # Outcomes start at -1 (none chosen), so shift by one for bincount
+        outcome_counts = np.bincount(records["outcome"][is_completed].astype(np.int64) + 1)
+        return {
+            "games": self.count,
+            "by_status": {STATUS_NAMES[s]: int(c) for s, c in enumerate(status_counts) if c},
+            "by_outcome": {o - 1: int(c) for o, c in enumerate(outcome_counts) if c},
+            "burned_bbt": float(records["burned_gwei"].sum(dtype=np.float64) / GWEI),
+            "rewards_avax": float(np.dot(records["reward_gwei"], is_completed) / GWEI),
+            "mean_confirm_ms": (float(np.dot(records["confirm_ms"], is_completed) / completed_count)
+                                if completed_count else 0.0),
+        }
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__.strip().splitlines()[-1])
+        return
+    start = time.perf_counter()
+    reader = JournalReader(sys.argv[1])
+    summary = reader.stats()
+    elapsed = time.perf_counter() - start
+    print(f"📒 {sys.argv[1]}: {summary['games']:,} games in {elapsed * 1000:.1f} ms")
+    for key, value in summary.items():
+        if key != "games":
+            print(f"  - {key}: {value}")
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
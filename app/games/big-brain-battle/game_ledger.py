@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory game ledger for the BigBrain Battle bot
+Keeps in-flight and recent games in slotted records with O(1) lookup by gameId
+Run directly to benchmark memory use at 1M games
+"""
+
+import time
+from collections import OrderedDict
+
+# Game lifecycle states
+STATE_DETECTED = 0
+STATE_THINKING = 1
+STATE_SUBMITTED = 2
+STATE_COMPLETED = 3
+STATE_FAILED = 4
+STATE_RETRYING = 5
+
+STATE_NAMES = ["DETECTED", "THINKING", "SUBMITTED", "COMPLETED", "FAILED", "RETRYING"]
+IN_FLIGHT_STATES = (STATE_DETECTED, STATE_THINKING, STATE_SUBMITTED, STATE_RETRYING)
+
+NO_OUTCOME = -1
+
+
+class GameRecord:
+    """Everything the bot tracks about a single game, without a per-instance __dict__"""
+
+    __slots__ = (
+        "game_id",
+        "block_number",
+        "burned_amount",
+        "game_type",
+        "outcome",
+        "tx_hash",
+        "state",
+        "created_at",
+    )
+
+    def __init__(self, game_id, block_number, burned_amount, game_type, created_at):
+        self.game_id = game_id
+        self.block_number = block_number
+        self.burned_amount = burned_amount
+        self.game_type = game_type
+        self.outcome = NO_OUTCOME
+        self.tx_hash = None
+        self.state = STATE_DETECTED
+        self.created_at = created_at
+
+    @property
+    def in_flight(self):
+        return self.state in IN_FLIGHT_STATES
+
+    def __repr__(self):
+        return (
+            f"GameRecord(game_id={self.game_id}, block={self.block_number}, "
+            f"type={self.game_type}, outcome={self.outcome}, "
+            f"state={STATE_NAMES[self.state]})"
+        )
+
+
+class GameLedger:
+    """Bounded map of gameId -> GameRecord, evicted oldest-first by age and size"""
+
+    def __init__(self, max_games=100000, max_age=6 * 3600, clock=time.monotonic):
+        self.max_games = max_games
+        self.max_age = max_age
+        self._clock = clock
+        # Insertion order doubles as age order, so eviction only ever looks at the front
+        self._games = OrderedDict()
+
+    def __len__(self):
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
+
+    def get(self, game_id):
+        """Return the record for a gameId, or None"""
+        return self._games.get(game_id)
+
+    def add(self, game_id, block_number, burned_amount, game_type):
+        """Register a newly detected game; returns the existing record if already known"""
+        record = self._games.get(game_id)
+        if record is not None:
+            return record
+
+        record = GameRecord(game_id, block_number, burned_amount, game_type, self._clock())
+        self._games[game_id] = record
+
+        if len(self._games) > self.max_games:
+            self.evict()
+        return record
+
+    def update(self, game_id, **fields):
+        """Update fields on a tracked game; unknown gameIds are ignored"""
+        record = self._games.get(game_id)
+        if record is None:
+            return None
+        for name, value in fields.items():
+            setattr(record, name, value)
+        return record
+
+    def mark_completed(self, game_id, block_number, outcome):
+        """Record that a game was completed on-chain, by us or anyone else"""
+        record = self._games.get(game_id)
+        if record is None:
+            # Completed before we ever saw it start - burn and type are unknown
+            record = self.add(game_id, block_number, None, None)
+        record.outcome = outcome
+        record.state = STATE_COMPLETED
+        return record
+
+    def discard(self, game_id):
+        """Forget a game entirely, e.g. when its GameStarted log was reorged out"""
+        return self._games.pop(game_id, None)
+
+    def is_done(self, game_id):
+        """True if the game was completed on-chain"""
+        record = self._games.get(game_id)
+        return record is not None and record.state == STATE_COMPLETED
+
+    def is_busy(self, game_id):
+        """True if the game is completed, in progress, queued for retry or dead-lettered"""
+        return game_id in self._games
+
+    def in_flight(self):
+        """Records that have not reached a terminal state"""
+        # list() copies in one step, so the admin thread can call this while the loop mutates
+        return [record for record in list(self._games.values()) if record.in_flight]
+
+    def state_counts(self):
+        """Number of tracked games in each state, keyed by state name"""
+        counts = dict.fromkeys(STATE_NAMES, 0)
+        for record in list(self._games.values()):
+            counts[STATE_NAMES[record.state]] += 1
+        return counts
+
+    def evict(self, now=None):
+        """Drop expired games from the front; in-flight games are rotated rather than dropped"""
+        now = self._clock() if now is None else now
+        cutoff = now - self.max_age
+        games = self._games
+        evicted = 0
+        rotated = 0
+
+        while games and rotated < len(games):
+            game_id, record = next(iter(games.items()))
+            too_old = record.created_at < cutoff
+            too_many = len(games) > self.max_games
+            if not (too_old or too_many):
+                break
+
+            if record.in_flight:
+                # Never forget a game we still owe a completion for
+                games.move_to_end(game_id)
+                rotated += 1
+                continue
+
+            games.popitem(last=False)
+            evicted += 1
+
+        return evicted
+
+
+def _benchmark(count=1_000_000):
+    """Measure ledger memory and lookup cost at `count` games"""
+    import random
+    import tracemalloc
+
+    ledger = GameLedger(max_games=count, max_age=float("inf"))
+    base_block = 40_000_000
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for game_id in range(count):
+        record = ledger.add(
+            game_id,
+            base_block + game_id // 4,
+            random.randint(1, 100_000) * 10**18,
+            game_id % 3,
+        )
+        record.outcome = game_id % 4
+        record.tx_hash = random.randbytes(32)
+        record.state = STATE_COMPLETED
+    insert_seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    probes = [random.randrange(count) for _ in range(100_000)]
+    start = time.perf_counter()
+    for game_id in probes:
+        ledger.get(game_id)
+    lookup_seconds = time.perf_counter() - start
+
+    ledger.max_games = count // 2
+    start = time.perf_counter()
+    evicted = ledger.evict()
+    evict_seconds = time.perf_counter() - start
+
+    print(f"📊 GameLedger benchmark ({count:,} games)")
+    print(f"  - Memory: {current / 2**20:.1f} MiB ({current / count:.0f} bytes/game, peak {peak / 2**20:.1f} MiB)")
+    print(f"  - Insert: {insert_seconds:.2f}s ({count / insert_seconds:,.0f} games/s)")
+    print(f"  - Lookup: {lookup_seconds / len(probes) * 1e9:.0f} ns/lookup")
+    print(f"  - Evict:  {evicted:,} games in {evict_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,88 @@
+"""
+Drain-and-handoff state for rolling restarts of the BigBrain Battle bot
+On SIGTERM the bot stops taking new games and writes its in-flight work (games not
+yet sent, unconfirmed completion txs, retry backlog, next nonce and log cursor) to a
+JSON snapshot; the next instance takes the snapshot and carries on from there.
+A rolling restart needs the new instance to wait for the snapshot (BOT_HANDOFF_WAIT
+> 0): one that starts before the old one has drained runs without it, alongside it
+"""
+
+import json
+import os
+import signal
+import time
+
+HANDOFF_VERSION = 1
+
+
+class StaleHandoff(ValueError):
+    """A snapshot too old to resume: its cursor and nonces belong to a long-gone run"""
+
+
+class DrainSignal:
+    """Turns SIGTERM (or any of `signals`) into a drain request instead of a kill"""
+
+    def __init__(self, signals=(signal.SIGTERM,)):
+        self.signals = signals
+        self.requested = False
+        self.requested_at = None
+        self._previous = {}
+
+    def install(self):
+        """Returns False where handlers can't be installed (not on the main thread)"""
+        try:
+            for signum in self.signals:
+                self._previous[signum] = signal.signal(signum, self._handle)
+        except ValueError:
+            self.restore()
+            return False
+        return True
+
+    def _handle(self, signum, frame):
+        if not self.requested:
+            self.requested = True
+            self.requested_at = time.monotonic()
+
+    def restore(self):
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)
+        self._previous.clear()
+
+
+def write_handoff(path, snapshot):
+    """Atomically write a handoff snapshot; a reader never sees a half-written file"""
+    snapshot = {"handoff": HANDOFF_VERSION, "writtenAt": time.time(), **snapshot}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def take_handoff(path, wait=0.0, poll=0.2, max_age=None):
+    """
+    Read and claim the snapshot at `path`, waiting up to `wait` seconds for the
+    previous instance to write it. The file is renamed to `<path>.resumed` so a
+    later restart can't resume the same work twice. Returns None if there is none.
+    A snapshot written more than `max_age` seconds ago is moved to `<path>.stale`
+    and StaleHandoff is raised instead.
+    """
+    if not path:
+        return None
+    deadline = time.monotonic() + wait
+    while not os.path.exists(path):
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(poll)
+
+    with open(path) as f:
+        snapshot = json.load(f)
+    if snapshot.get("handoff") != HANDOFF_VERSION:
+        raise ValueError(f"{path} has an unsupported handoff version")
+    age = time.time() - snapshot.get("writtenAt", 0)
+    if max_age is not None and age > max_age:
+        os.replace(path, path + ".stale")
+        raise StaleHandoff(f"{path} was written {age:.0f}s ago (max {max_age:.0f}s)")
+    os.replace(path, path + ".resumed")
+    return snapshot
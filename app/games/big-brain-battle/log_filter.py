@@ -0,0 +1,104 @@
+"""
+Server-side log filter polling for the BigBrain Battle bot
+Installs one eth_newFilter for the game topics and pulls only new logs with
+eth_getFilterChanges; when the node expires the filter it is reinstalled and
+the gap is backfilled with eth_getLogs
+"""
+
+# Node error messages for a filter that was never installed or has expired
+FILTER_GONE_HINTS = ("filter not found", "filter does not exist", "unknown filter", "filter id")
+
+
+def is_filter_gone(error):
+    message = str(error).lower()
+    return any(hint in message for hint in FILTER_GONE_HINTS)
+
+
+class LogFilterPoller:
+    """Keeps an eth_newFilter alive and returns every matching log exactly once per install"""
+
+    def __init__(self, w3, addresses, topics, backfill_chunk=2000, head_every=10):
+        self.w3 = w3
+        self.addresses = list(addresses)
+        self.topics = topics
+        self.backfill_chunk = backfill_chunk
+        self.head_every = head_every  # Polls between head reads that advance synced_block
+        self._polls = 0
+        self.filter_id = None
+        self.synced_block = None  # Highest block whose logs have all been returned
+        self.reinstalls = 0
+        self.backfilled_blocks = 0
+        self._rescan_from = None
+        self._pending = []  # Backfilled at install time, handed out by the next poll()
+
+    def _params(self):
+        return {'address': self.addresses, 'topics': self.topics}
+
+    def start(self, from_block):
+        """Install the filter; the first poll() also returns everything from `from_block` to the head"""
+        self._install(from_block)
+
+    def _install(self, backfill_from):
+        # Install before reading the head so no block can fall between the two;
+        # overlap is harmless because the ledger ignores games it already knows
+        self.filter_id = self.w3.eth.filter({**self._params(), 'fromBlock': 'latest'}).filter_id
+        head = self.w3.eth.block_number
+        self._pending.extend(self._backfill(backfill_from, head))
+        self.synced_block = head if self.synced_block is None else max(self.synced_block, head)
+
+    def _backfill(self, from_block, to_block):
+        logs = []
+        start = from_block
+        while start <= to_block:
+            end = min(to_block, start + self.backfill_chunk - 1)
+            logs.extend(self.w3.eth.get_logs({**self._params(), 'fromBlock': start, 'toBlock': end}))
+            start = end + 1
+        self.backfilled_blocks += max(0, to_block - from_block + 1)
+        return logs
+
+    def rewind(self, block_number):
+        """Re-read logs from `block_number` on the next poll, e.g. after a reorg"""
+        self._rescan_from = block_number if self._rescan_from is None else min(self._rescan_from, block_number)
+
+    def poll(self, head=None):
+        """
+        New logs since the last poll (normally a single eth_getFilterChanges call).
+        `head` is a block number the caller read just before; once the poll succeeds
+        every block up to it counts as synced. Without one the head is read here only
+        every `head_every` polls (or for a rescan), so quiet stretches still move
+        synced_block forward without an extra call per poll.
+        """
+        self._polls += 1
+        if head is None and (self._rescan_from is not None or self._polls % self.head_every == 0):
+            head = self.w3.eth.block_number
+        if self._rescan_from is not None:
+            self._pending.extend(self._backfill(self._rescan_from, head))
+            self._rescan_from = None
+
+        try:
+            changes = self.w3.eth.get_filter_changes(self.filter_id)
+        except Exception as e:
+            if not is_filter_gone(e):
+                raise
+            # The node dropped our filter (idle timeout, node restart, load balancer
+            # switched backends) - reinstall it and fetch whatever we missed meanwhile
+            self.reinstalls += 1
+            self._install(self.synced_block + 1)
+            changes = []
+
+        # Backfilled logs are only released once a poll succeeds, so an RPC error can't drop them.
+        # Reorged-out logs come back flagged as removed; the reorg tracker handles those
+        logs, self._pending = self._pending, []
+        logs.extend(log for log in changes if not log.get('removed'))
+        # The filter has reported everything up to at least a head read before the call
+        self.synced_block = max(self.synced_block, head or 0, *(log['blockNumber'] for log in logs))
+        return logs
+
+    def uninstall(self):
+        if self.filter_id is None:
+            return
+        try:
+            self.w3.eth.uninstall_filter(self.filter_id)
+        except Exception:
+            pass  # Already expired on the node
+        self.filter_id = None
@@ -5,19 +5,81 @@ Listens for GameStarted events and responds with AI outcomes
 Now pays rewards in AVAX instead of tokens
 """
 
+import os
 import time
 import random
 import json
 from datetime import datetime
 from web3 import Web3
+from web3.exceptions import TimeExhausted, TransactionNotFound
 from eth_account import Account
 
+from game_ledger import (
+    STATE_DETECTED,
+    STATE_THINKING,
+    STATE_SUBMITTED,
+    STATE_COMPLETED,
+    STATE_FAILED,
+    STATE_RETRYING,
+)
+from reorg_tracker import ReorgTracker, STARTED, COMPLETED
+from tx_signer import CompleteGameCalldata, SigningService
+from rpc_budget import RpcBudget, AdaptivePollInterval
+from retry_queue import ALREADY_COMPLETED, NONCE, REORGED, REVERTED, RPC_TRANSIENT
+from game_journal import STATUS_COMPLETED, STATUS_FAILED
+from game_arena import GameArena, arena_path
+from admin_server import AdminServer, RpcTracer
+from log_filter import LogFilterPoller
+from rpc_cassette import CassetteRecorder
+from preflight import BatchSimulator, intrinsic_gas
+from handoff import DrainSignal, StaleHandoff, take_handoff, write_handoff
+
+# Configuration
+RPC_URL = "https://avax-fuji.g.alchemy.com/v2/7NBTdVMFlqXaf5D-r-0kb73aehWeZ1Aj"
+GAME_CONTRACT_ADDRESS = "0x7D56425650a0EFf5111c79c39A27319Ca45138a1"  # Update this!
+# Comma-separated list to serve several deployments from one process
+GAME_CONTRACT_ADDRESSES = [
+    address.strip() for address in os.getenv('GAME_CONTRACT_ADDRESSES', GAME_CONTRACT_ADDRESS).split(',')
+    if address.strip()
+]
+# How long a handed-off transaction may stay unconfirmed before it is retried
+HANDOFF_RECEIPT_TIMEOUT = 120
+# Widest eth_getLogs range per poll while catching up after a restart
+MAX_LOG_RANGE = 2000
+# Blocks behind the cursor re-read each poll as overlap (the ledger skips games it knows)
+LOG_OVERLAP = 10
+
 class SimpleGameBot:
     """A simple AI opponent that responds to game challenges"""
     
-    def __init__(self, rpc_url, private_key, game_contract_address):
-        """Initialize the game bot"""
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+    def __init__(self, rpc_url, private_key, game_contract_address, reorg_depth=32,
+                 signing_workers=0, compute_units_per_second=330,
+                 max_retries_per_poll=2, dead_letter_path="dead_letters.json",
+                 journal_path="game_journal.bin", admin_port=None, provider=None,
+                 cassette_path=None, handoff_path="handoff.json", arena_overrides=None):
+        """
+        Initialize the game bot. `arena_overrides` maps a contract address to
+        {"win_rates": {game type: AI win rate}, "messages": {message type: [lines]}}
+        for that arena; anything left out uses the bot's own odds and messages.
+        """
+        # `provider` overrides the HTTP endpoint, e.g. a CassetteProvider for offline replay
+        self.w3 = Web3(provider or Web3.HTTPProvider(rpc_url))
+        
+        # Introspection for the admin server: per-RPC timings (off until enabled),
+        # what the main loop is doing right now, and where the chain/cursor are.
+        # Added before the budget so it sits inside it: timings exclude throttle waits
+        self.rpc_tracer = RpcTracer()
+        self.w3.middleware_onion.add(self.rpc_tracer.middleware, name="rpc_tracer")
+        
+        # Every RPC call is charged against our plan's compute-unit budget
+        self.rpc_budget = RpcBudget(compute_units_per_second)
+        self.w3.middleware_onion.add(self.rpc_budget.middleware, name="rpc_budget")
+        self.poll_interval = AdaptivePollInterval()
+        
+        self.admin_port = admin_port
+        self.activity = ("starting", time.monotonic())
+        self.chain_head = None
+        self.cursor_block = None
         self.account = Account.from_key(private_key)
         
         if not self.w3.is_connected():
@@ -26,9 +88,53 @@ class SimpleGameBot:
         print(f"🤖 SimpleGameBot: Connected to blockchain")
         print(f"🤖 SimpleGameBot: Bot wallet: {self.account.address}")
         
-        # Game contract setup
-        self.game_contract_address = self.w3.to_checksum_address(game_contract_address)
-        self.game_contract = self._setup_game_contract()
+        # Game contract setup - one address or several deployments (arenas) sharing
+        # this process, its polling, signer, nonce and fee machinery
+        if isinstance(game_contract_address, str):
+            game_contract_address = [game_contract_address]
+        addresses = [self.w3.to_checksum_address(address) for address in game_contract_address]
+        if not addresses:
+            raise ValueError("At least one game contract address is required")
+        shared = len(addresses) > 1
+        self.arenas = {}
+        for address in addresses:
+            self.arenas[address] = GameArena(
+                address,
+                self._setup_game_contract(address),
+                max_retries_per_poll=max_retries_per_poll,
+                dead_letter_path=arena_path(dead_letter_path, address, shared),
+                journal_path=arena_path(journal_path, address, shared),
+            )
+        self._log_addresses = list(self.arenas)
+        
+        # Optional capture of every raw JSON-RPC exchange for offline replay. It sits in
+        # the innermost layer, so recorded timings are network latency without throttling
+        self.cassette = None
+        if cassette_path:
+            self.cassette = CassetteRecorder(
+                cassette_path,
+                meta={"contracts": self._log_addresses, "account": self.account.address},
+            )
+            self.w3.middleware_onion.inject(self.cassette.middleware, name="cassette", layer=0)
+            print(f"🤖 SimpleGameBot: 📼 Recording RPC cassette to {cassette_path}")
+        self._game_started_topic = self.w3.keccak(text="GameStarted(uint256,address,address,uint256,uint8,uint256)")
+        self._game_completed_topic = self.w3.keccak(text="GameCompleted(uint256,address,uint8,uint256,string,uint256)")
+        self._game_config_topic = self.w3.keccak(text="GameConfigUpdated(uint8,uint256,uint256)")
+        self._log_topics = [[self._game_started_topic, self._game_completed_topic, self._game_config_topic]]
+        self.log_filter = None  # Set by listen_for_games(poll_mode="filter")
+        
+        # completeGame calldata template and signer (process pool when signing_workers > 0)
+        self.calldata = CompleteGameCalldata()
+        self.signer = SigningService(private_key, 43113, workers=signing_workers)  # Avalanche Fuji testnet
+        # One eth_call simulates a whole batch of completions before anything is signed
+        self.preflight = BatchSimulator(self.w3, self.account.address)
+        
+        # Rolling restarts: SIGTERM drains the bot and hands its in-flight work
+        # (unsent games, unconfirmed txs, retries, nonce, cursor) to the next instance
+        self.handoff_path = handoff_path
+        self.drain = DrainSignal()
+        self._submitted = {}  # (contract address, gameId) -> (job, tx_hash) awaiting a receipt
+        self._next_nonce = None
         
         # AI personality settings
         self.ai_name = "Neural Network Alpha"
@@ -37,17 +143,51 @@ class SimpleGameBot:
             1: 0.5,  # ARENA_FIGHT - 50% AI win rate  
             2: 0.7,  # BOSS_BATTLE - 70% AI win rate (30% player win rate)
         }
+        self.thinking_time = (1, 5)  # Seconds of "thinking" per batch of games (min, max)
         
         # Response messages
         self._setup_response_messages()
         
-        print(f"🤖 SimpleGameBot: Game contract at {self.game_contract_address}")
+        # Per-contract odds tables and messages
+        for address, overrides in (arena_overrides or {}).items():
+            arena = self.arenas.get(self.w3.to_checksum_address(address.strip()))
+            if arena is None:
+                raise ValueError(f"Overrides given for {address}, which is not a served game contract")
+            if overrides.get('win_rates') is not None:
+                arena.win_rates = {int(game_type): rate for game_type, rate in overrides['win_rates'].items()}
+            if overrides.get('messages') is not None:
+                arena.messages = {**self.messages, **overrides['messages']}
+        
+        # Block hashes of everything we acted on, checked until `reorg_depth` deep.
+        # Each arena keeps its own ledger, retry queue and journal; games are keyed
+        # by (contract address, gameId) here since gameIds repeat across arenas
+        self.reorg_tracker = ReorgTracker(self.w3, depth=reorg_depth)
+        
+        for address in self.arenas:
+            print(f"🤖 SimpleGameBot: Game contract at {address}")
         print(f"🤖 SimpleGameBot: AI personality: {self.ai_name}")
         
         # Check initial AVAX reward pool
-        self._check_reward_pool()
+        for arena in self.arenas.values():
+            self._check_reward_pool(arena)
+    
+    @property
+    def primary_arena(self):
+        """The first configured contract; the default for single-arena callers"""
+        return next(iter(self.arenas.values()))
     
-    def _setup_game_contract(self):
+    @property
+    def game_contract_address(self):
+        return self.primary_arena.address
+    
+    @property
+    def game_contract(self):
+        return self.primary_arena.contract
+    
+    def _arena_for(self, address):
+        return self.arenas.get(address) or self.arenas.get(self.w3.to_checksum_address(address))
+    
+    def _setup_game_contract(self, address):
         """Setup the game contract with minimal ABI"""
         # Updated ABI with AVAX reward functions
         game_abi = [
@@ -100,6 +240,29 @@ class SimpleGameBot:
                 "name": "GameStarted",
                 "type": "event"
             },
+            {
+                "inputs": [{"name": "", "type": "uint8"}],
+                "name": "gameConfigs",
+                "outputs": [
+                    {"name": "minBurnAmount", "type": "uint256"},
+                    {"name": "baseRewardWei", "type": "uint256"},
+                    {"name": "rewardPerToken", "type": "uint256"},
+                    {"name": "winProbability", "type": "uint256"},
+                    {"name": "enabled", "type": "bool"}
+                ],
+                "stateMutability": "view",
+                "type": "function"
+            },
+            {
+                "anonymous": False,
+                "inputs": [
+                    {"indexed": False, "name": "gameType", "type": "uint8"},
+                    {"indexed": False, "name": "minBurn", "type": "uint256"},
+                    {"indexed": False, "name": "rewardMultiplier", "type": "uint256"}
+                ],
+                "name": "GameConfigUpdated",
+                "type": "event"
+            },
             {
                 "anonymous": False,
                 "inputs": [
@@ -116,16 +279,19 @@ class SimpleGameBot:
         ]
         
         return self.w3.eth.contract(
-            address=self.game_contract_address,
+            address=address,
             abi=game_abi
         )
     
-    def _check_reward_pool(self):
+    def _check_reward_pool(self, arena=None):
         """Check the current AVAX reward pool balance"""
+        arena = arena or self.primary_arena
         try:
-            pool_balance = self.game_contract.functions.getAvaxRewardPool().call()
+            pool_balance = arena.contract.functions.getAvaxRewardPool().call()
+            arena.pool_balance = pool_balance
+            arena.pool_checked_at = time.monotonic()
             pool_avax = self.w3.from_wei(pool_balance, 'ether')
-            print(f"🤖 SimpleGameBot: 💰 AVAX reward pool: {pool_avax:.6f} AVAX")
+            print(f"🤖 SimpleGameBot: 💰 AVAX reward pool ({arena.label}): {pool_avax:.6f} AVAX")
             
             if pool_balance < self.w3.to_wei(0.01, 'ether'):  # Less than 0.01 AVAX
                 print(f"🤖 SimpleGameBot: ⚠️ WARNING: Reward pool is low!")
@@ -173,9 +339,10 @@ class SimpleGameBot:
             ]
         }
     
-    def _determine_outcome(self, game_type, burned_amount):
+    def _determine_outcome(self, game_type, burned_amount, arena=None):
         """Determine game outcome based on game type and some randomness"""
-        ai_win_rate = self.win_rates.get(game_type, 0.5)
+        win_rates = arena.win_rates if arena is not None and arena.win_rates is not None else self.win_rates
+        ai_win_rate = win_rates.get(game_type, 0.5)
         
         # Add some randomness based on burn amount (higher stakes = slightly better player odds)
         burned_tokens = float(self.w3.from_wei(burned_amount, 'ether'))
@@ -198,10 +365,11 @@ class SimpleGameBot:
             # Player Victory
             return 0, "player_victory"
     
-    def _get_ai_message(self, message_type, game_type, burned_amount, potential_reward):
+    def _get_ai_message(self, message_type, game_type, burned_amount, potential_reward, base_message=None,
+                        arena=None):
         """Get appropriate AI message for the outcome"""
-        base_messages = self.messages[message_type]
-        message = random.choice(base_messages)
+        base_messages = self._messages_for(arena)[message_type]
+        message = base_message or random.choice(base_messages)
         
         # Add some context based on game type
         game_types = ["quick battle", "arena fight", "boss battle"]
@@ -219,128 +387,346 @@ class SimpleGameBot:
         
         return message
     
-    def _calculate_potential_reward(self, burned_amount, game_type, outcome):
-        """Calculate the potential AVAX reward for this outcome"""
+    def _messages_for(self, arena):
+        """An arena's own message set, or the bot's"""
+        if arena is not None and arena.messages is not None:
+            return arena.messages
+        return self.messages
+    
+    def _calculate_potential_reward(self, burned_amount, game_type, outcome, arena=None):
+        """Calculate the potential AVAX reward for this outcome (locally, see reward_quotes.py)"""
+        arena = arena or self.primary_arena
         try:
-            potential_reward = self.game_contract.functions.calculatePotentialReward(
-                burned_amount,
-                game_type,
-                outcome
-            ).call()
-            return potential_reward
+            return arena.quotes.quote(burned_amount, game_type, outcome)
         except Exception as e:
             print(f"🤖 SimpleGameBot: ⚠️ Could not calculate potential reward: {e}")
             return 0
     
-    def complete_game(self, game_id, game_type, burned_amount):
+    def complete_game(self, game_id, game_type, burned_amount, arena=None):
         """Complete a game with AI response"""
+        return self.complete_games([(game_id, game_type, burned_amount, arena or self.primary_arena)])[0]
+    
+    def complete_games(self, games):
+        """
+        Complete a batch of (game_id, game_type, burned_amount, arena) games.
+        
+        Every completeGame call is simulated in one pre-flight eth_call; games that would
+        revert are dropped with their decoded reason, the rest are signed with consecutive
+        nonces and sent back to back before waiting for receipts. Returns one bool per game.
+        """
+        results = {}
+        jobs = []
+        for game_id, game_type, burned_amount, arena in games:
+            job = self._prepare_completion(game_id, game_type, burned_amount, arena)
+            if job is None:
+                results[(arena.address, game_id)] = False
+            else:
+                jobs.append(job)
+        
+        jobs = self._preflight_completions(jobs, results)
+        sent = self._send_completions(jobs, results)
+        for job, tx_hash in sent:
+            if self.drain.requested:
+                # Don't hold up the restart - the next instance tracks the receipt
+                continue
+            results[(job['arena'].address, job['game_id'])] = self._confirm_completion(job, tx_hash)
+        
+        return [results.get((arena.address, game_id), False) for game_id, _, _, arena in games]
+    
+    def _prepare_completion(self, game_id, game_type, burned_amount, arena):
+        """Decide the outcome, quote and message for a game and encode its calldata"""
+        # Lifecycle details for the journal, filled in as the game progresses
+        trace = {'game_type': game_type, 'burned_amount': burned_amount}
         try:
             print(f"🤖 SimpleGameBot: Processing game #{game_id} (type: {game_type})")
             
             # Determine outcome
-            outcome, message_type = self._determine_outcome(game_type, burned_amount)
+            outcome, message_type = self._determine_outcome(game_type, burned_amount, arena)
+            arena.ledger.update(game_id, outcome=outcome)
+            trace['outcome'] = outcome
             
             # Calculate potential AVAX reward
-            potential_reward = self._calculate_potential_reward(burned_amount, game_type, outcome)
+            potential_reward = self._calculate_potential_reward(burned_amount, game_type, outcome, arena)
+            trace['reward'] = potential_reward
             
-            # Generate AI message with reward info
-            ai_message = self._get_ai_message(message_type, game_type, burned_amount, potential_reward)
+            # Generate AI message with reward info (the base line is interned in the journal)
+            base_message = random.choice(self._messages_for(arena)[message_type])
+            ai_message = self._get_ai_message(message_type, game_type, burned_amount, potential_reward, base_message,
+                                              arena=arena)
+            trace['message'] = base_message
             
             print(f"🤖 SimpleGameBot: 🎯 Chosen outcome: {outcome} ({message_type})")
             print(f"🤖 SimpleGameBot: 💰 AVAX reward: {self.w3.from_wei(potential_reward, 'ether'):.6f}")
             print(f"🤖 SimpleGameBot: 💬 AI message: \"{ai_message}\"")
             
-            # Check if reward pool has enough AVAX before proceeding
-            current_pool = self.game_contract.functions.getAvaxRewardPool().call()
-            if current_pool < potential_reward:
+            # Warn from the last pool reading; the pre-flight simulation has the final say
+            if arena.pool_balance is not None and arena.pool_balance < potential_reward:
                 print(f"🤖 SimpleGameBot: ⚠️ WARNING: Insufficient AVAX pool!")
-                print(f"🤖 SimpleGameBot: 💰 Pool: {self.w3.from_wei(current_pool, 'ether'):.6f} AVAX")
+                print(f"🤖 SimpleGameBot: 💰 Pool: {self.w3.from_wei(arena.pool_balance, 'ether'):.6f} AVAX")
                 print(f"🤖 SimpleGameBot: 💸 Need: {self.w3.from_wei(potential_reward, 'ether'):.6f} AVAX")
                 
-                # Could implement auto-funding here if desired
-                # For now, just proceed and let the contract handle the error
+            return {
+                'game_id': game_id,
+                'game_type': game_type,
+                'burned_amount': burned_amount,
+                'arena': arena,
+                'outcome': outcome,
+                'reward': potential_reward,
+                'ai_message': ai_message,
+                'calldata': self.calldata.encode(game_id, outcome, ai_message),
+                'trace': trace,
+            }
+        except Exception as e:
+            self._fail_completion(arena, game_id, game_type, burned_amount, trace, e)
+            return None
             
-            # First, try to estimate gas to catch issues early
-            try:
-                gas_estimate = self.game_contract.functions.completeGame(
-                    game_id,
-                    outcome,
-                    ai_message
-                ).estimate_gas({'from': self.account.address})
-                print(f"🤖 SimpleGameBot: ⛽ Gas estimate: {gas_estimate}")
-            except Exception as gas_error:
-                print(f"🤖 SimpleGameBot: ❌ Gas estimation failed: {gas_error}")
-                print(f"🤖 SimpleGameBot: 🔍 This suggests the transaction would fail")
+    def _preflight_completions(self, jobs, results):
+        """Simulate every pending completeGame in one request; returns the jobs that would succeed"""
+        if not jobs:
+            return []
                 
-                # Check specific error conditions
-                if "Insufficient AVAX reward pool" in str(gas_error):
-                    print(f"🤖 SimpleGameBot: 💰 Issue: Not enough AVAX in reward pool")
+        self._set_activity(f"preflight {len(jobs)} games")
+        try:
+            simulations = self.preflight.simulate([(job['arena'].address, job['calldata']) for job in jobs])
+        except Exception as e:
+            print(f"🤖 SimpleGameBot: ❌ Pre-flight simulation failed: {e}")
+            for job in jobs:
+                self._fail_job(job, e, results)
+            return []
                 
-                return False
+        passed = []
+        for job, simulation in zip(jobs, simulations):
+            if simulation.success:
+                job['gas_limit'] = simulation.gas_used + intrinsic_gas(job['calldata']) + 50000  # Add buffer
+                print(f"🤖 SimpleGameBot: ⛽ Game #{job['game_id']} pre-flight OK, gas used: {simulation.gas_used}")
+                passed.append(job)
+                continue
             
-            # Build transaction with estimated gas + buffer
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
+            print(f"🤖 SimpleGameBot: ❌ Game #{job['game_id']} would fail: {simulation.revert_reason}")
+            
+            # Check specific error conditions
+            if "Insufficient AVAX reward pool" in simulation.revert_reason:
+                print(f"🤖 SimpleGameBot: 💰 Issue: Not enough AVAX in reward pool")
+            
+            self._fail_job(job, simulation.revert_reason, results)
+        return passed
+    
+    def _send_completions(self, jobs, results):
+        """Sign the batch with consecutive nonces and send it; returns [(job, tx_hash)]"""
+        if not jobs:
+            return []
+        
+        # Build transactions with simulated gas + buffer, one nonce/gas price read per batch
+        self._set_activity(f"send_raw_transaction x{len(jobs)}")
+        try:
+            # 'pending' so completions still in the mempool keep their nonces; handed-off
+            # txs the node hasn't caught up on are covered by the handoff's nextNonce
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+            if self._submitted and self._next_nonce is not None:
+                nonce = max(nonce, self._next_nonce)
             gas_price = self.w3.eth.gas_price
             
             print(f"🤖 SimpleGameBot: 📊 Transaction details:")
-            print(f"🤖 SimpleGameBot:   - Nonce: {nonce}")
-            print(f"🤖 SimpleGameBot:   - Gas: {gas_estimate + 50000}")
+            print(f"🤖 SimpleGameBot:   - Nonces: {nonce}..{nonce + len(jobs) - 1}")
             print(f"🤖 SimpleGameBot:   - Gas Price: {gas_price}")
             
-            txn = self.game_contract.functions.completeGame(
-                game_id,
-                outcome,
-                ai_message
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': gas_estimate + 50000,  # Add buffer to estimate
-                'gasPrice': gas_price,
-                'nonce': nonce,
-                'chainId': 43113  # Avalanche Fuji testnet
-            })
+            # Fill the pre-encoded completeGame template instead of build_transaction
+            txns = [
+                self.signer.build(job['arena'].address, job['calldata'], nonce + i, job['gas_limit'], gas_price)
+                for i, job in enumerate(jobs)
+            ]
+            raw_txns = self.signer.sign_batch(txns)
+        except Exception as e:
+            for job in jobs:
+                self._fail_job(job, e, results)
+            return []
             
-            # Sign and send
-            signed_txn = self.account.sign_transaction(txn)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        sent = []
+        for i, (job, raw_txn) in enumerate(zip(jobs, raw_txns)):
+            game_id = job['game_id']
+            try:
+                tx_hash = self.w3.eth.send_raw_transaction(raw_txn)
+            except Exception as e:
+                print(f"🤖 SimpleGameBot: ❌ Error sending game #{game_id}: {e}")
+                self._fail_job(job, e, results)
+                # Later nonces would be stuck behind the gap - retry them with fresh ones
+                for skipped in jobs[i + 1:]:
+                    self._fail_job(skipped, f"not sent: nonce gap after game #{game_id}", results, NONCE)
+                break
             
-            print(f"🤖 SimpleGameBot: ⏳ Transaction sent: {self.w3.to_hex(tx_hash)}")
-            print(f"🤖 SimpleGameBot: ⏳ Waiting for confirmation...")
+            job['trace'].update(gas_price=gas_price, tx_hash=bytes(tx_hash), sent_at=time.monotonic())
+            job['nonce'] = nonce + i
+            job['arena'].ledger.update(game_id, tx_hash=bytes(tx_hash), state=STATE_SUBMITTED)
+            self._submitted[(job['arena'].address, game_id)] = (job, tx_hash)
+            self._next_nonce = nonce + i + 1
+            print(f"🤖 SimpleGameBot: ⏳ Transaction sent for game #{game_id}: {self.w3.to_hex(tx_hash)}")
+            sent.append((job, tx_hash))
+        return sent
+    
+    def _confirm_completion(self, job, tx_hash):
+        """Wait for one completion's receipt and record the result"""
+        game_id = job['game_id']
+        try:
+            print(f"🤖 SimpleGameBot: ⏳ Waiting for confirmation of game #{game_id}...")
             
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            self._set_activity(f"wait_for_transaction_receipt #{game_id}")
+            receipt = self._wait_for_receipt(tx_hash, timeout=120)
+        except Exception as e:
+            self._submitted.pop((job['arena'].address, game_id), None)
+            self._fail_completion(job['arena'], game_id, job['game_type'], job['burned_amount'], job['trace'], e)
+            return False
+        if receipt is None:
+            print(f"🤖 SimpleGameBot: 🚚 Draining, handing game #{game_id} receipt to the next instance")
+            return False
+        return self._finish_completion(job, tx_hash, receipt)
+    
+    def _wait_for_receipt(self, tx_hash, timeout=120, poll_latency=0.1):
+        """wait_for_transaction_receipt that gives up early (returns None) when draining"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                if self.drain.requested:
+                    return None
+                if time.monotonic() >= deadline:
+                    raise TimeExhausted(
+                        f"Transaction {self.w3.to_hex(tx_hash)} is not in the chain after {timeout} seconds"
+                    )
+                time.sleep(poll_latency)
+    
+    def _finish_completion(self, job, tx_hash, receipt):
+        """Record a completion whose receipt has arrived"""
+        arena = job['arena']
+        game_id = job['game_id']
+        outcome = job['outcome']
+        trace = job['trace']
+        self._submitted.pop((arena.address, game_id), None)
+        try:
+            trace.update(
+                confirmed_at=time.monotonic(),
+                confirmed_block=receipt.blockNumber,
+                gas_used=receipt.gasUsed,
+            )
             
             if receipt.status == 1:
                 outcomes = ["PLAYER_VICTORY", "AI_VICTORY", "DRAW", "EPIC_VICTORY"]
                 outcome_name = outcomes[outcome] if outcome < len(outcomes) else "UNKNOWN"
-                reward_avax = self.w3.from_wei(potential_reward, 'ether')
+                reward_avax = self.w3.from_wei(job['reward'], 'ether')
                 
                 print(f"🤖 SimpleGameBot: ✅ Game #{game_id} completed!")
                 print(f"🤖 SimpleGameBot: 🎯 Outcome: {outcome_name}")
                 print(f"🤖 SimpleGameBot: 💰 AVAX reward: {reward_avax:.6f}")
-                print(f"🤖 SimpleGameBot: 💬 Message: \"{ai_message}\"")
+                print(f"🤖 SimpleGameBot: 💬 Message: \"{job['ai_message']}\"")
                 print(f"🤖 SimpleGameBot: 📋 TX: {self.w3.to_hex(tx_hash)}")
                 print(f"🤖 SimpleGameBot: ⛽ Gas used: {receipt.gasUsed}")
                 
+                arena.ledger.update(game_id, state=STATE_COMPLETED)
+                self.reorg_tracker.watch(receipt.blockNumber, receipt.blockHash, (arena.address, game_id), COMPLETED)
+                self._journal_game(arena, game_id, trace, STATUS_COMPLETED)
+                
                 # Update reward pool info
-                self._check_reward_pool()
+                self._check_reward_pool(arena)
                 return True
             else:
                 print(f"🤖 SimpleGameBot: ❌ Transaction failed for game #{game_id}")
                 print(f"🤖 SimpleGameBot: 📋 Failed TX: {self.w3.to_hex(tx_hash)}")
                 print(f"🤖 SimpleGameBot: ⛽ Gas used: {receipt.gasUsed}")
+                self._fail_completion(
+                    arena, game_id, job['game_type'], job['burned_amount'], trace,
+                    f"transaction {self.w3.to_hex(tx_hash)} reverted on-chain", REVERTED
+                )
                 return False
                 
         except Exception as e:
-            print(f"🤖 SimpleGameBot: ❌ Error completing game #{game_id}: {e}")
-            print(f"🤖 SimpleGameBot: 🔍 Error type: {type(e).__name__}")
+            self._fail_completion(arena, game_id, job['game_type'], job['burned_amount'], trace, e)
+            return False
+    
+    def _fail_job(self, job, error, results, failure_class=None):
+        results[(job['arena'].address, job['game_id'])] = False
+        self._fail_completion(
+            job['arena'], job['game_id'], job['game_type'], job['burned_amount'], job['trace'],
+            error, failure_class
+        )
+    
+    def _fail_completion(self, arena, game_id, game_type, burned_amount, trace, error, failure_class=None):
+        """Report a failed completion, hand it to the retry queue and journal it"""
+        if isinstance(error, Exception):
+            print(f"🤖 SimpleGameBot: ❌ Error completing game #{game_id}: {error}")
+            print(f"🤖 SimpleGameBot: 🔍 Error type: {type(error).__name__}")
             
             # Print more detailed error info
-            if hasattr(e, 'args') and e.args:
-                print(f"🤖 SimpleGameBot: 🔍 Error args: {e.args}")
+            if hasattr(error, 'args') and error.args:
+                print(f"🤖 SimpleGameBot: 🔍 Error args: {error.args}")
             
-            return False
+        failure_class = self._record_failure(arena, game_id, game_type, burned_amount, error, failure_class)
+        self._journal_game(arena, game_id, trace, STATUS_FAILED, failure_class)
     
-    def deposit_avax_to_pool(self, amount_avax):
+    def _set_activity(self, activity):
+        """Record what the main loop is doing, for the admin /status endpoint"""
+        self.activity = (activity, time.monotonic())
+    
+    def _record_failure(self, arena, game_id, game_type, burned_amount, error, failure_class=None):
+        """Classify a failed completion and hand it to the arena's retry queue"""
+        failure_class = arena.retry_queue.record_failure(
+            game_id, game_type, burned_amount, error, failure_class
+        )
+        
+        if failure_class == ALREADY_COMPLETED:
+            print(f"🤖 SimpleGameBot: ✔️ Game #{game_id} was already completed, dropping it")
+            arena.ledger.update(game_id, state=STATE_COMPLETED)
+        elif game_id in arena.retry_queue:
+            print(f"🤖 SimpleGameBot: 🔁 Game #{game_id} queued for retry ({failure_class})")
+            arena.ledger.update(game_id, state=STATE_RETRYING)
+        else:
+            print(f"🤖 SimpleGameBot: ☠️ Game #{game_id} moved to dead letters ({failure_class})")
+            arena.ledger.update(game_id, state=STATE_FAILED)
+        return failure_class
+    
+    def _journal_game(self, arena, game_id, trace, status, failure_class=""):
+        """Append one completion attempt to the arena's lifecycle journal"""
+        if arena.journal is None:
+            return
+        
+        record = arena.ledger.get(game_id)
+        detected_block = record.block_number if record is not None else 0
+        detected_mono = record.created_at if record is not None else None
+        sent_at = trace.get('sent_at')
+        confirmed_at = trace.get('confirmed_at')
+        
+        arena.journal.append(
+            game_id,
+            status,
+            detected_block=detected_block,
+            confirmed_block=trace.get('confirmed_block', 0),
+            burned_amount=trace['burned_amount'],
+            reward=trace.get('reward', 0),
+            gas_price=trace.get('gas_price', 0),
+            gas_used=trace.get('gas_used', 0),
+            message=trace.get('message'),
+            game_type=trace['game_type'],
+            outcome=trace.get('outcome', -1),
+            failure_class=failure_class,
+            tx_hash=trace.get('tx_hash', b""),
+            detected_at=time.time() - (time.monotonic() - detected_mono) if detected_mono else time.time(),
+            send_ms=(sent_at - detected_mono) * 1000 if sent_at and detected_mono else 0,
+            confirm_ms=(confirmed_at - sent_at) * 1000 if confirmed_at and sent_at else 0,
+        )
+    
+    def replay_dead_letters(self, game_ids=None, arena=None):
+        """Put dead-lettered games (all, or the given gameIds) back on the retry queue"""
+        arenas = [arena] if arena is not None else self.arenas.values()
+        replayed = []
+        for arena in arenas:
+            for game_id in arena.retry_queue.replay(game_ids):
+                arena.ledger.update(game_id, state=STATE_RETRYING)
+                replayed.append(game_id)
+        print(f"🤖 SimpleGameBot: 🔁 Replaying {len(replayed)} dead-lettered games")
+        return replayed
+    
+    def deposit_avax_to_pool(self, amount_avax, arena=None):
         """Deposit AVAX to the reward pool"""
+        arena = arena or self.primary_arena
         try:
             amount_wei = self.w3.to_wei(amount_avax, 'ether')
             
@@ -355,16 +741,16 @@ class SimpleGameBot:
                 return False
             
             # Estimate gas
-            gas_estimate = self.game_contract.functions.depositAvax().estimate_gas({
+            gas_estimate = arena.contract.functions.depositAvax().estimate_gas({
                 'from': self.account.address,
                 'value': amount_wei
             })
             
             # Build transaction
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
             gas_price = self.w3.eth.gas_price
             
-            txn = self.game_contract.functions.depositAvax().build_transaction({
+            txn = arena.contract.functions.depositAvax().build_transaction({
                 'from': self.account.address,
                 'value': amount_wei,
                 'gas': gas_estimate + 10000,
@@ -383,7 +769,7 @@ class SimpleGameBot:
             
             if receipt.status == 1:
                 print(f"🤖 SimpleGameBot: ✅ Successfully deposited {amount_avax} AVAX!")
-                self._check_reward_pool()
+                self._check_reward_pool(arena)
                 return True
             else:
                 print(f"🤖 SimpleGameBot: ❌ Deposit failed")
@@ -393,119 +779,552 @@ class SimpleGameBot:
             print(f"🤖 SimpleGameBot: ❌ Error depositing AVAX: {e}")
             return False
     
-    def listen_for_games(self, auto_fund_threshold=0.01):
-        """Listen for GameStarted events and respond"""
+    def _fetch_game_logs(self, from_block, to_block):
+        """
+        Fetch GameStarted and GameCompleted logs for every arena in a single
+        eth_getLogs call, so RPC cost stays flat as arenas are added
+        """
+        logs = self.w3.eth.get_logs({
+            'address': self._log_addresses,
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'topics': self._log_topics,
+        })
+        return self._decode_game_logs(logs)
+    
+    def _decode_game_logs(self, logs):
+        """Split raw logs into decoded (GameStarted, GameCompleted) events, routed by arena"""
+        started_events = []
+        completed_events = []
+        for log in logs:
+            arena = self._arena_for(log['address'])
+            if arena is None:
+                continue
+            topic = log['topics'][0]
+            if topic == self._game_completed_topic:
+                completed_events.append(arena.contract.events.GameCompleted().process_log(log))
+            elif topic == self._game_config_topic:
+                # The owner changed reward parameters - re-read them before the next quote
+                game_type = arena.contract.events.GameConfigUpdated().process_log(log)['args']['gameType']
+                print(f"🤖 SimpleGameBot: ⚙️ Game config {game_type} updated, refreshing reward quotes")
+                arena.quotes.refresh(game_type)
+            else:
+                started_events.append(arena.contract.events.GameStarted().process_log(log))
+        return started_events, completed_events
+    
+    def _index_completed_event(self, event):
+        """Remember a completed gameId so the bot never quotes, estimates or signs for it"""
+        arena = self._arena_for(event['address'])
+        game_id = event['args']['gameId']
+        if arena.ledger.is_done(game_id):
+            return
+        
+        arena.ledger.mark_completed(game_id, event['blockNumber'], event['args']['outcome'])
+        arena.retry_queue.discard(game_id)
+        self.reorg_tracker.watch(event['blockNumber'], event['blockHash'], (arena.address, game_id), COMPLETED)
+    
+    def _process_game_event(self, event):
+        """Register a decoded GameStarted event; returns the game to complete, or None"""
+        arena = self._arena_for(event['address'])
+        game_id = event['args']['gameId']
+        player = event['args']['player']
+        burned_amount = event['args']['burnedAmount']
+        game_type = event['args']['gameType']
+        
+        # Skip if already completed or in progress
+        if arena.ledger.is_busy(game_id):
+            return None
+        
+        arena.ledger.add(game_id, event['blockNumber'], burned_amount, game_type)
+        
+        # Remember which block the game came from so a reorg can be detected later
+        self.reorg_tracker.watch(event['blockNumber'], event['blockHash'], (arena.address, game_id), STARTED)
+        
+        print(f"\n🤖 SimpleGameBot: 🎮 New game detected!")
+        if len(self.arenas) > 1:
+            print(f"🤖 SimpleGameBot: 🏟️ Arena: {arena.address}")
+        print(f"🤖 SimpleGameBot: 🆔 Game ID: {game_id}")
+        print(f"🤖 SimpleGameBot: 👤 Player: {player}")
+        print(f"🤖 SimpleGameBot: 🔥 Burned: {self.w3.from_wei(burned_amount, 'ether')} BBT")
+        print(f"🤖 SimpleGameBot: 🎯 Type: {game_type}")
+        
+        # Preview potential rewards for all outcomes
+        outcomes = [0, 1, 2, 3]  # PLAYER_VICTORY, AI_VICTORY, DRAW, EPIC_VICTORY
+        outcome_names = ["PLAYER_VICTORY", "AI_VICTORY", "DRAW", "EPIC_VICTORY"]
+        
+        self._set_activity(f"quoting #{game_id}")
+        print(f"🤖 SimpleGameBot: 💰 Potential AVAX rewards:")
+        for i, outcome in enumerate(outcomes):
+            potential = self._calculate_potential_reward(burned_amount, game_type, outcome, arena)
+            reward_avax = self.w3.from_wei(potential, 'ether')
+            print(f"🤖 SimpleGameBot:   - {outcome_names[i]}: {reward_avax:.6f} AVAX")
+        
+        arena.ledger.update(game_id, state=STATE_THINKING)
+        return game_id, game_type, burned_amount, arena
+    
+    def _dispatch_game_events(self, events, completed_events):
+        """Index completions, then handle new games as one batch"""
+        # Starts and completions come back together; index completions first so
+        # games finished elsewhere are dropped before any quote/simulate/sign work
+        for event in completed_events:
+            self._index_completed_event(event)
+        
+        games = []
+        for event in events:
+            try:
+                game = self._process_game_event(event)
+            except Exception as event_error:
+                print(f"🤖 SimpleGameBot: ⚠️ Error processing event: {event_error}")
+                continue
+            if game is not None:
+                games.append(game)
+        if not games:
+            return
+        
+        # Add thinking delay (1-5 seconds) to make it feel more realistic, once per batch
+        thinking_time = random.randint(*self.thinking_time)
+        print(f"🤖 SimpleGameBot: 🧠 AI is thinking about {len(games)} game(s)... ({thinking_time}s)")
+        self._set_activity(f"thinking x{len(games)}")
+        time.sleep(thinking_time)
+        
+        if self.drain.requested:
+            # Still unsent - these go to the next instance with the handoff
+            print(f"🤖 SimpleGameBot: 🚚 Draining, handing {len(games)} game(s) to the next instance")
+            return
+        
+        # Complete the games
+        self.complete_games(games)
+        
+        print(f"🤖 SimpleGameBot: ⏭️ Continuing to monitor for new games...\n")
+    
+    def _check_reward_quotes(self, samples=3):
+        """Compare a few cached local quotes per arena with calculatePotentialReward()"""
+        for arena in self.arenas.values():
+            try:
+                mismatches = arena.quotes.check(samples)
+            except Exception as e:
+                print(f"🤖 SimpleGameBot: ⚠️ Could not check reward quotes: {e}")
+                continue
+            for (burned_amount, game_type, outcome), local, on_chain in mismatches:
+                print(f"🤖 SimpleGameBot: ⚠️ Reward quote drift ({arena.label}) for type {game_type} outcome {outcome}: "
+                      f"local {local} != contract {on_chain} wei, configs re-read")
+    
+    def _start_log_filter(self, from_block):
+        """Install the server-side log filter; returns None if the node doesn't support filters"""
+        log_filter = LogFilterPoller(self.w3, self._log_addresses, self._log_topics)
+        try:
+            log_filter.start(from_block)
+        except Exception as e:
+            print(f"🤖 SimpleGameBot: ⚠️ eth_newFilter unavailable ({e}), falling back to eth_getLogs polling")
+            return None
+        print(f"🤖 SimpleGameBot: 🔭 Server-side log filter installed (synced to block {log_filter.synced_block})")
+        return log_filter
+    
+    def _check_for_reorgs(self, current_block):
+        """Cancel or re-queue games whose logs/receipts were reorged out; returns the fork block"""
+        fork_block, orphaned = self.reorg_tracker.check(current_block)
+        if fork_block is None:
+            return None
+        
+        print(f"🤖 SimpleGameBot: 🔀 Reorg detected back to block {fork_block} ({len(orphaned)} games affected)")
+        
+        for (address, game_id), kind, block_number in orphaned:
+            arena = self.arenas[address]
+            record = arena.ledger.get(game_id)
+            if record is None:
+                continue
+            
+            if kind == STARTED:
+                # The game may not exist on the new chain - forget it and let the rescan re-detect it
+                print(f"🤖 SimpleGameBot: 🔀 Game #{game_id} start log orphaned at block {block_number}, cancelling")
+                arena.ledger.discard(game_id)
+            elif record.burned_amount is None:
+                # Completed by someone else before we saw it start - the rescan will pick it up
+                arena.ledger.discard(game_id)
+            else:
+                # The completion fell out of the canonical chain - complete it again
+                print(f"🤖 SimpleGameBot: 🔀 Completion of game #{game_id} orphaned at block {block_number}, re-queueing")
+                self._record_failure(
+                    arena, game_id, record.game_type, record.burned_amount,
+                    f"completion reorged out at block {block_number}", REORGED
+                )
+        
+        return fork_block
+    
+    def _retry_due_games(self):
+        """Re-attempt games whose retry backoff has elapsed, a bounded number per poll per arena"""
+        games = []
+        for arena in self.arenas.values():
+            for entry in arena.retry_queue.due():
+                game_id = entry.game_id
+                if arena.ledger.is_done(game_id):
+                    continue
+                
+                if game_id not in arena.ledger:
+                    # Replayed after the ledger already evicted it
+                    arena.ledger.add(game_id, None, entry.burned_amount, entry.game_type)
+                
+                print(f"🤖 SimpleGameBot: 🔁 Retrying game #{game_id} (attempt {entry.attempts + 1}, last failure: {entry.failure_class})")
+                arena.ledger.update(game_id, state=STATE_THINKING)
+                games.append((game_id, entry.game_type, entry.burned_amount, arena))
+        
+        if games:
+            self.complete_games(games)
+    
+    def _poll_submitted_receipts(self):
+        """Settle handed-off transactions whose receipts have arrived, without blocking"""
+        for key, (job, tx_hash) in list(self._submitted.items()):
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                if time.monotonic() - job['trace']['sent_at'] < HANDOFF_RECEIPT_TIMEOUT:
+                    continue
+                del self._submitted[key]
+                self._fail_completion(
+                    job['arena'], job['game_id'], job['game_type'], job['burned_amount'], job['trace'],
+                    f"transaction {self.w3.to_hex(tx_hash)} is not in the chain after {HANDOFF_RECEIPT_TIMEOUT} seconds",
+                    RPC_TRANSIENT
+                )
+                continue
+            self._finish_completion(job, tx_hash, receipt)
+    
+    def _handoff_snapshot(self, cursor_block):
+        """Everything the next instance needs to carry on exactly where this one stops"""
+        submitted = []
+        for (address, game_id), (job, tx_hash) in self._submitted.items():
+            record = job['arena'].ledger.get(game_id)
+            submitted.append({
+                "arena": address,
+                "gameId": game_id,
+                "block": record.block_number if record is not None else None,
+                "gameType": job['game_type'],
+                "burnedAmount": str(job['burned_amount']),
+                "outcome": job['outcome'],
+                "reward": str(job['reward']),
+                "aiMessage": job['ai_message'],
+                "message": job['trace'].get('message'),
+                "gasPrice": job['trace'].get('gas_price', 0),
+                "nonce": job['nonce'],
+                "txHash": self.w3.to_hex(tx_hash),
+            })
+        
+        games = []
+        retrying = []
+        for arena in self.arenas.values():
+            for record in arena.ledger.in_flight():
+                if record.state in (STATE_DETECTED, STATE_THINKING) and record.game_id not in arena.retry_queue:
+                    games.append({
+                        "arena": arena.address,
+                        "gameId": record.game_id,
+                        "block": record.block_number,
+                        "gameType": record.game_type,
+                        "burnedAmount": str(record.burned_amount),
+                    })
+            retrying.extend({"arena": arena.address, **item} for item in arena.retry_queue.pending())
+        
+        return {
+            "account": self.account.address,
+            "contracts": self._log_addresses,
+            "cursorBlock": cursor_block,
+            "chainHead": self.chain_head,
+            "nextNonce": self._next_nonce,
+            "games": games,
+            "submitted": submitted,
+            "retrying": retrying,
+        }
+    
+    def _resume_from_handoff(self, snapshot):
+        """Adopt a previous instance's in-flight work; returns (cursor block, games to complete)"""
+        def arena_of(item):
+            arena = self.arenas.get(item['arena'])
+            if arena is None:
+                print(f"🤖 SimpleGameBot: ⚠️ Handoff game #{item['gameId']} is for {item['arena']}, "
+                      f"which this instance doesn't serve - skipping")
+            return arena
+        
+        same_account = snapshot['account'] == self.account.address
+        if not same_account:
+            print(f"🤖 SimpleGameBot: ⚠️ Handoff was written by {snapshot['account']}, not this wallet")
+        
+        # Transactions the old instance sent but never saw confirmed. Anything at or
+        # above the account's pending nonce was dropped from the mempool: retry it now
+        pending_nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending') if same_account else None
+        dropped = False
+        for item in snapshot['submitted']:
+            arena = arena_of(item)
+            if arena is None:
+                continue
+            game_id = item['gameId']
+            burned_amount = int(item['burnedAmount'])
+            tx_hash = bytes.fromhex(item['txHash'][2:])
+            arena.ledger.add(game_id, item['block'], burned_amount, item['gameType'])
+            arena.ledger.update(game_id, outcome=item['outcome'], tx_hash=tx_hash, state=STATE_SUBMITTED)
+            job = {
+                'game_id': game_id,
+                'game_type': item['gameType'],
+                'burned_amount': burned_amount,
+                'arena': arena,
+                'outcome': item['outcome'],
+                'reward': int(item['reward']),
+                'ai_message': item['aiMessage'],
+                'nonce': item['nonce'],
+                'trace': {
+                    'game_type': item['gameType'],
+                    'burned_amount': burned_amount,
+                    'outcome': item['outcome'],
+                    'reward': int(item['reward']),
+                    'message': item['message'],
+                    'gas_price': item['gasPrice'],
+                    'tx_hash': tx_hash,
+                    'sent_at': time.monotonic(),
+                },
+            }
+            if pending_nonce is not None and item['nonce'] >= pending_nonce:
+                self._fail_completion(
+                    arena, game_id, item['gameType'], burned_amount, job['trace'],
+                    f"handed-off transaction {item['txHash']} (nonce {item['nonce']}) was dropped", NONCE
+                )
+                dropped = True
+                continue
+            self._submitted[(arena.address, game_id)] = (job, tx_hash)
+        
+        # New completions start above every handed-off tx still pending. After a drop the
+        # node's pending count is the right start - nextNonce would leave a nonce gap
+        if same_account and not dropped and snapshot.get('nextNonce') is not None:
+            self._next_nonce = max(snapshot['nextNonce'], pending_nonce)
+        
+        for item in snapshot['retrying']:
+            arena = arena_of(item)
+            if arena is None:
+                continue
+            arena.retry_queue.restore([item])
+            arena.ledger.add(item['gameId'], None, int(item['burnedAmount']), item['gameType'])
+            arena.ledger.update(item['gameId'], state=STATE_RETRYING)
+        
+        games = []
+        for item in snapshot['games']:
+            arena = arena_of(item)
+            if arena is None:
+                continue
+            burned_amount = int(item['burnedAmount'])
+            arena.ledger.add(item['gameId'], item['block'], burned_amount, item['gameType'])
+            arena.ledger.update(item['gameId'], state=STATE_THINKING)
+            games.append((item['gameId'], item['gameType'], burned_amount, arena))
+        
+        print(f"🤖 SimpleGameBot: 🚚 Resumed from handoff at block {snapshot['cursorBlock']}: "
+              f"{len(games)} unsent, {len(self._submitted)} unconfirmed, {len(snapshot['retrying'])} retrying")
+        return snapshot['cursorBlock'], games
+    
+    def _stop_listening(self, log_filter, admin):
+        """Release everything listen_for_games() set up"""
+        self.drain.restore()
+        if log_filter is not None:
+            log_filter.uninstall()
+        self.signer.close()
+        for arena in self.arenas.values():
+            arena.close()
+        if self.cassette is not None:
+            self.cassette.close()
+        if admin is not None:
+            admin.stop()
+    
+    def listen_for_games(self, auto_fund_threshold=0.01, confirmations=0, pool_check_interval=60,
+                         poll_mode="logs", quote_check_interval=600, handoff_wait=0.0,
+                         handoff_max_age=600.0):
+        """
+        Listen for GameStarted events and respond.
+        
+        poll_mode="logs" reads the head and queries eth_getLogs from the cursor every
+        poll. poll_mode="filter" installs an eth_newFilter once and fetches only new logs
+        with eth_getFilterChanges; the head is read every poll while reorg checks are
+        pending and otherwise only every few polls to advance the cursor. An expired
+        filter is reinstalled and the gap backfilled. Filter mode acts at the chain
+        head, so it requires confirmations=0.
+        
+        confirmations=0 completes games optimistically at the chain head; every log and
+        receipt the bot acts on is re-checked against the canonical chain and reorged
+        games are cancelled or re-queued. Set confirmations > 0 to only act on logs that
+        are at least that many blocks deep.
+        
+        The reward pool is re-read at most every `pool_check_interval` seconds and the
+        poll interval adapts to block time and recent game traffic. Reward quotes are
+        computed locally; every `quote_check_interval` seconds a few of them are compared
+        against calculatePotentialReward() to catch drift (None disables the check).
+        
+        With a handoff path, SIGTERM drains the bot instead of killing it: no new games are
+        taken, unconfirmed txs are not waited for, and the in-flight work and log cursor are
+        written to the handoff file before exiting. A starting bot resumes from that file,
+        waiting up to `handoff_wait` seconds for it; a rolling restart needs this to be
+        non-zero, or the new bot starts fresh alongside the draining one. Snapshots older
+        than `handoff_max_age` seconds (None: no limit) are set aside, not resumed.
+        """
         print(f"🤖 SimpleGameBot: 👂 Listening for new games...")
-        print(f"🤖 SimpleGameBot: 🎯 Monitoring contract: {self.game_contract_address}")
+        for address in self.arenas:
+            print(f"🤖 SimpleGameBot: 🎯 Monitoring contract: {address}")
         print(f"🤖 SimpleGameBot: 💰 Auto-fund threshold: {auto_fund_threshold} AVAX")
+        if confirmations:
+            print(f"🤖 SimpleGameBot: 🧱 Waiting for {confirmations} confirmations per game")
+        else:
+            print(f"🤖 SimpleGameBot: ⚡ Optimistic mode: acting at chain head (reorg depth {self.reorg_tracker.depth})")
+        
+        if poll_mode not in ("logs", "filter"):
+            raise ValueError(f"Unknown poll_mode: {poll_mode}")
+        if poll_mode == "filter" and confirmations:
+            raise ValueError("poll_mode='filter' acts at the chain head; use confirmations=0")
         
         # Get the latest block to start listening from
-        latest_block = self.w3.eth.block_number
+        latest_block = self.w3.eth.block_number - confirmations
         print(f"🤖 SimpleGameBot: 📦 Starting from block: {latest_block}")
         
-        processed_games = set()  # Track processed games to avoid duplicates
+        rescan_from = None  # Set when a reorg forces us to re-read older blocks
+        quotes_checked_at = time.monotonic()
+        
+        # Carry on from the instance we replace: its games, txs and exact cursor
+        resumed_games = []
+        try:
+            handoff = take_handoff(self.handoff_path, wait=handoff_wait, max_age=handoff_max_age)
+        except StaleHandoff as e:
+            print(f"🤖 SimpleGameBot: ⚠️ Ignoring stale handoff: {e}")
+            handoff = None
+        if handoff is not None:
+            cursor_block, resumed_games = self._resume_from_handoff(handoff)
+            latest_block = rescan_from = min(latest_block, cursor_block)
+            print(f"🤖 SimpleGameBot: 📦 Catching up from block: {latest_block}")
+        if self.handoff_path and self.drain.install():
+            print(f"🤖 SimpleGameBot: 🚚 SIGTERM drains to {self.handoff_path} for a rolling restart")
+        
+        if poll_mode == "filter":
+            self.log_filter = self._start_log_filter(latest_block)
+            if self.log_filter is not None:
+                rescan_from = None  # Its install backfill already started at the handoff cursor
+        log_filter = self.log_filter
+        if log_filter is not None:
+            latest_block = log_filter.synced_block
+            self.chain_head = latest_block
+        
+        admin = None
+        if self.admin_port:
+            admin = AdminServer(self, port=self.admin_port).start()
+            print(f"🤖 SimpleGameBot: 🩺 Admin server on {admin.address} (/status, /profile, /trace)")
         
         while True:
             try:
-                # Check reward pool periodically
-                current_pool = self.game_contract.functions.getAvaxRewardPool().call()
-                current_pool_avax = self.w3.from_wei(current_pool, 'ether')
+                if self.drain.requested:
+                    write_handoff(self.handoff_path, self._handoff_snapshot(latest_block))
+                    print(f"\n🤖 SimpleGameBot: 🚚 Drained in {time.monotonic() - self.drain.requested_at:.1f}s, "
+                          f"handoff written to {self.handoff_path} (cursor block {latest_block})")
+                    self._stop_listening(log_filter, admin)
+                    break
+                
+                # Check reward pool periodically (it only moves on completions and deposits,
+                # both of which refresh it themselves)
+                for arena in self.arenas.values():
+                    if time.monotonic() - arena.pool_checked_at < pool_check_interval:
+                        continue
+                    current_pool = arena.contract.functions.getAvaxRewardPool().call()
+                    current_pool_avax = self.w3.from_wei(current_pool, 'ether')
+                    arena.pool_balance = current_pool
+                    arena.pool_checked_at = time.monotonic()
+                    
+                    if current_pool_avax < auto_fund_threshold:
+                        print(f"🤖 SimpleGameBot: 💰 Reward pool low ({current_pool_avax:.6f} AVAX) at {arena.address}")
+                        print(f"🤖 SimpleGameBot: 💰 Consider funding the pool with depositAvax()")
                 
-                if current_pool_avax < auto_fund_threshold:
-                    print(f"🤖 SimpleGameBot: 💰 Reward pool low ({current_pool_avax:.6f} AVAX)")
-                    print(f"🤖 SimpleGameBot: 💰 Consider funding the pool with depositAvax()")
+                # Spot-check local reward quotes against the contract
+                if quote_check_interval and time.monotonic() - quotes_checked_at >= quote_check_interval:
+                    self._check_reward_quotes()
+                    quotes_checked_at = time.monotonic()
                 
-                # Get current block
-                current_block = self.w3.eth.block_number
+                # Time-based journal flushes, even when no new games are being appended
+                for arena in self.arenas.values():
+                    if arena.journal is not None:
+                        arena.journal.maybe_flush()
                 
-                # Check for new GameStarted events in the last few blocks
-                from_block = max(latest_block, current_block - 10)  # Look back max 10 blocks
+                # Get current block (filter mode only needs it to re-check watched blocks)
+                self._set_activity("polling")
+                if log_filter is not None and not len(self.reorg_tracker):
+                    current_block = self.chain_head
+                    head = None  # The poller reads it itself every few polls
+                else:
+                    current_block = head = self.w3.eth.block_number
+                    self.chain_head = current_block
+                    
+                    # Make sure everything we acted on is still canonical
+                    fork_block = self._check_for_reorgs(current_block)
+                    if fork_block is not None:
+                        rescan_from = fork_block if rescan_from is None else min(rescan_from, fork_block)
+                
+                # Work handed over by the previous instance comes first
+                if resumed_games:
+                    self.complete_games(resumed_games)
+                    resumed_games = []
+                if self._submitted:
+                    self._poll_submitted_receipts()
+                
+                # A few due retries per poll, so they never starve fresh games
+                self._retry_due_games()
                 
                 # Use a more reliable method to get events
                 try:
-                    # Try using the contract's event filter first
-                    events = self.game_contract.events.GameStarted.get_logs(
-                        fromBlock=from_block,
-                        toBlock=current_block
-                    )
-                    
-                    for event in events:
-                        try:
-                            # Event is already decoded
-                            decoded_log = event
-                            
-                            game_id = decoded_log['args']['gameId']
-                            player = decoded_log['args']['player']
-                            burned_amount = decoded_log['args']['burnedAmount']
-                            game_type = decoded_log['args']['gameType']
-                            
-                            # Skip if already processed
-                            if game_id in processed_games:
-                                continue
-                            
-                            print(f"\n🤖 SimpleGameBot: 🎮 New game detected!")
-                            print(f"🤖 SimpleGameBot: 🆔 Game ID: {game_id}")
-                            print(f"🤖 SimpleGameBot: 👤 Player: {player}")
-                            print(f"🤖 SimpleGameBot: 🔥 Burned: {self.w3.from_wei(burned_amount, 'ether')} BBT")
-                            print(f"🤖 SimpleGameBot: 🎯 Type: {game_type}")
-                            
-                            # Preview potential rewards for all outcomes
-                            outcomes = [0, 1, 2, 3]  # PLAYER_VICTORY, AI_VICTORY, DRAW, EPIC_VICTORY
-                            outcome_names = ["PLAYER_VICTORY", "AI_VICTORY", "DRAW", "EPIC_VICTORY"]
-                            
-                            print(f"🤖 SimpleGameBot: 💰 Potential AVAX rewards:")
-                            for i, outcome in enumerate(outcomes):
-                                potential = self._calculate_potential_reward(burned_amount, game_type, outcome)
-                                reward_avax = self.w3.from_wei(potential, 'ether')
-                                print(f"🤖 SimpleGameBot:   - {outcome_names[i]}: {reward_avax:.6f} AVAX")
-                            
-                            # Add thinking delay (1-5 seconds) to make it feel more realistic
-                            thinking_time = random.randint(1, 5)
-                            print(f"🤖 SimpleGameBot: 🧠 AI is thinking... ({thinking_time}s)")
-                            time.sleep(thinking_time)
-                            
-                            # Complete the game
-                            success = self.complete_game(game_id, game_type, burned_amount)
-                            
-                            if success:
-                                processed_games.add(game_id)
-                            
-                            print(f"🤖 SimpleGameBot: ⏭️ Continuing to monitor for new games...\n")
+                    if log_filter is not None:
+                        # Only logs the node hasn't handed us yet, in one eth_getFilterChanges
+                        if rescan_from is not None:
+                            log_filter.rewind(rescan_from)
+                            rescan_from = None
+                        events, completed_events = self._decode_game_logs(log_filter.poll(head))
+                        latest_block = log_filter.synced_block
+                        current_block = self.chain_head = max(current_block, latest_block)
+                    else:
+                        # Carry on from the cursor, a chunk at a time when we are far behind
+                        to_block = current_block - confirmations
+                        if to_block <= latest_block and rescan_from is None:
+                            time.sleep(self.poll_interval.observe(current_block, 0))
+                            continue
+                        from_block = max(latest_block - LOG_OVERLAP, 0)
+                        if rescan_from is not None:
+                            from_block = min(from_block, rescan_from)
+                        to_block = min(to_block, from_block + MAX_LOG_RANGE - 1)
                         
-                        except Exception as event_error:
-                            print(f"🤖 SimpleGameBot: ⚠️ Error processing event: {event_error}")
+                        if from_block > to_block:
+                            time.sleep(self.poll_interval.observe(current_block, 0))
                             continue
+                        
+                        events, completed_events = self._fetch_game_logs(from_block, to_block)
+                        rescan_from = None
+                        
+                        # Update latest block
+                        if to_block > latest_block:
+                            latest_block = to_block
+                    
+                    self._dispatch_game_events(events, completed_events)
                     
                 except Exception as log_error:
                     print(f"🤖 SimpleGameBot: ⚠️ Error getting events: {log_error}")
                     
-                    # Fallback: try polling method if event filtering fails
-                    try:
-                        # Check recent transactions to/from the contract
-                        print(f"🤖 SimpleGameBot: 🔄 Trying fallback polling method...")
-                        
-                        # Simple fallback - just wait and check again
-                        time.sleep(5)
-                        continue
-                        
-                    except Exception as fallback_error:
-                        print(f"🤖 SimpleGameBot: ⚠️ Fallback method also failed: {fallback_error}")
-                        # Continue the main loop
+                    # The failing method is now backing off on its own; other calls are unaffected
+                    time.sleep(self.poll_interval.min_interval)
+                    continue
+                
+                self.cursor_block = latest_block
                 
-                # Update latest block
-                if current_block > latest_block:
-                    latest_block = current_block
+                # Drop games that have aged out of the ledgers
+                for arena in self.arenas.values():
+                    arena.ledger.evict()
                 
-                # Short sleep to avoid hammering the RPC
-                time.sleep(3)
+                # Sleep about a block while games are flowing, longer when idle
+                self._set_activity("idle")
+                time.sleep(self.poll_interval.observe(current_block, len(events)))
                 
             except KeyboardInterrupt:
                 print(f"\n🤖 SimpleGameBot: 🛑 Stopping bot...")
+                self._stop_listening(log_filter, admin)
                 break
             except Exception as e:
                 print(f"🤖 SimpleGameBot: ⚠️ Error in event loop: {e}")
-                print(f"🤖 SimpleGameBot: 🔄 Retrying in 10 seconds...")
-                time.sleep(10)  # Wait before retrying
+                # Failing RPC methods back off individually in the budget middleware
+                retry_in = self.poll_interval.interval
+                print(f"🤖 SimpleGameBot: 🔄 Retrying in {retry_in:.1f} seconds...")
+                time.sleep(retry_in)
     
     def test_connection(self):
         """Test the bot's connection and setup"""
@@ -521,8 +1340,9 @@ class SimpleGameBot:
             current_block = self.w3.eth.block_number
             print(f"🤖 SimpleGameBot: 📦 Current block: {current_block}")
             
-            # Check reward pool
-            self._check_reward_pool()
+            # Check reward pools
+            for arena in self.arenas.values():
+                self._check_reward_pool(arena)
             
             # Test event topic calculation
             try:
@@ -536,7 +1356,7 @@ class SimpleGameBot:
                 print(f"🤖 SimpleGameBot: ⚠️ Event test warning: {event_test_error}")
                 print(f"🤖 SimpleGameBot: 🔧 Bot will use fallback methods if needed")
             
-            # Test reward calculation
+            # Test reward calculation, local quote vs the contract
             try:
                 test_reward = self.game_contract.functions.calculatePotentialReward(
                     self.w3.to_wei(1000, 'ether'),  # 1000 tokens
@@ -545,6 +1365,12 @@ class SimpleGameBot:
                 ).call()
                 test_avax = self.w3.from_wei(test_reward, 'ether')
                 print(f"🤖 SimpleGameBot: 🧪 Test reward calculation: {test_avax:.6f} AVAX")
+                for arena in self.arenas.values():
+                    keys = [(self.w3.to_wei(1000, 'ether'), game_type, outcome)
+                            for game_type in arena.quotes.game_types for outcome in range(4)]
+                    mismatches = arena.quotes.check(keys=keys)
+                    print(f"🤖 SimpleGameBot: 🧪 Local reward quotes ({arena.label}): "
+                          f"{len(keys) - len(mismatches)}/{len(keys)} match the contract")
             except Exception as calc_error:
                 print(f"🤖 SimpleGameBot: ⚠️ Reward calculation test failed: {calc_error}")
             
@@ -560,14 +1386,9 @@ def main():
     """Main entry point"""
     print("🤖 SimpleGameBot: Starting BigBrain Battle Arena AI with AVAX rewards...")
     
-    # Configuration
-    RPC_URL = "https://avax-fuji.g.alchemy.com/v2/7NBTdVMFlqXaf5D-r-0kb73aehWeZ1Aj"
-    GAME_CONTRACT_ADDRESS = "0x7D56425650a0EFf5111c79c39A27319Ca45138a1"  # Update this!
-    
     # You'll need to set your private key here
     PRIVATE_KEY = input("🔑 Enter your private key (or set BOT_PRIVATE_KEY env var): ").strip()
     if not PRIVATE_KEY:
-        import os
         PRIVATE_KEY = os.getenv('BOT_PRIVATE_KEY')
     
     if not PRIVATE_KEY:
@@ -575,8 +1396,17 @@ def main():
         return
     
     try:
+        # Optional per-contract odds/messages: JSON {"0xCONTRACT": {"win_rates": {"0": 0.4}, "messages": {...}}}
+        arena_overrides = None
+        if os.getenv('BOT_ARENA_OVERRIDES'):
+            with open(os.getenv('BOT_ARENA_OVERRIDES')) as f:
+                arena_overrides = json.load(f)
+        
         # Initialize bot
-        bot = SimpleGameBot(RPC_URL, PRIVATE_KEY, GAME_CONTRACT_ADDRESS)
+        bot = SimpleGameBot(RPC_URL, PRIVATE_KEY, GAME_CONTRACT_ADDRESSES,
+                            cassette_path=os.getenv('BOT_CASSETTE'),
+                            handoff_path=os.getenv('BOT_HANDOFF', 'handoff.json'),
+                            arena_overrides=arena_overrides)
         
         # Test connection
         if not bot.test_connection():
@@ -597,7 +1427,12 @@ def main():
         
         # Start listening
         print(f"🤖 SimpleGameBot: 🚀 Bot is ready to battle with AVAX rewards!")
-        bot.listen_for_games()
+        bot.listen_for_games(
+            poll_mode=os.getenv('BOT_POLL_MODE', 'logs'),
+            # Set BOT_HANDOFF_WAIT > 0 for rolling restarts, so we wait for the old instance's snapshot
+            handoff_wait=float(os.getenv('BOT_HANDOFF_WAIT', '0')),
+            handoff_max_age=float(os.getenv('BOT_HANDOFF_MAX_AGE', '600')),
+        )
         
     except KeyboardInterrupt:
         print(f"\n🤖 SimpleGameBot: 👋 Goodbye!")
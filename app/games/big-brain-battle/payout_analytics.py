@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Payout and house-edge analytics for BigBrain Battle Arena
+Pulls GameStarted/GameCompleted history into columnar NumPy arrays and reports
+outcome frequencies, AVAX paid per BBT burned and pool drawdown, with an
+optional Monte Carlo run of a proposed odds table against the real burn distribution
+
+Usage:
+    python payout_analytics.py --from-block 30000000 [--to-block N] [--cache history.npz]
+    python payout_analytics.py --cache history.npz --simulate odds.json [--trials 200]
+    (simulated payouts use the contract's current gameConfigs, read over --rpc-url)
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from web3 import Web3
+
+from new_bot import RPC_URL, GAME_CONTRACT_ADDRESS
+from reward_quotes import AI_VICTORY, DRAW, EPIC_VICTORY, PLAYER_VICTORY, RewardQuoteEngine
+
+GAME_STARTED_TOPIC = Web3.keccak(text="GameStarted(uint256,address,address,uint256,uint8,uint256)")
+GAME_COMPLETED_TOPIC = Web3.keccak(text="GameCompleted(uint256,address,uint8,uint256,string,uint256)")
+
+OUTCOME_NAMES = ["PLAYER_VICTORY", "AI_VICTORY", "DRAW", "EPIC_VICTORY"]
+GAME_TYPE_NAMES = ["QUICK_BATTLE", "ARENA_FIGHT", "BOSS_BATTLE"]
+NO_OUTCOME = -1
+
+GAME_CONFIGS_ABI = [{
+    "inputs": [{"name": "", "type": "uint8"}],
+    "name": "gameConfigs",
+    "outputs": [
+        {"name": "minBurnAmount", "type": "uint256"},
+        {"name": "baseRewardWei", "type": "uint256"},
+        {"name": "rewardPerToken", "type": "uint256"},
+        {"name": "winProbability", "type": "uint256"},
+        {"name": "enabled", "type": "bool"},
+    ],
+    "stateMutability": "view",
+    "type": "function",
+}]
+
+# Mirrors SimpleGameBot._determine_outcome: per-type AI win rate, burn tiers applied
+# first-match (if/elif, so the 50k tier is currently unreachable), then fixed draw/epic bands
+DEFAULT_ODDS = {
+    "win_rates": {"0": 0.4, "1": 0.5, "2": 0.7},
+    "default_win_rate": 0.5,
+    "burn_tiers": [[10000, 0.9], [50000, 0.8]],
+    "draw": 0.05,
+    "epic": 0.10,
+}
+
+Z_95 = 1.959963984540054
+WEI = 1e18
+
+
+def fetch_history(w3, contract_address, from_block, to_block, chunk_size=2048):
+    """
+    Read both events over a block range with raw eth_getLogs and decode them by hand
+    (fixed ABI offsets) straight into arrays - much faster than per-log web3 decoding.
+    """
+    started = {"game_id": [], "block": [], "burned": [], "game_type": []}
+    completed = {"game_id": [], "block": [], "outcome": [], "reward": []}
+
+    for start in range(from_block, to_block + 1, chunk_size):
+        end = min(start + chunk_size - 1, to_block)
+        logs = w3.eth.get_logs({
+            "address": contract_address,
+            "fromBlock": start,
+            "toBlock": end,
+            "topics": [[GAME_STARTED_TOPIC, GAME_COMPLETED_TOPIC]],
+        })
+        for log in logs:
+            data = bytes(log["data"])
+            game_id = int.from_bytes(log["topics"][1], "big")
+            if log["topics"][0] == GAME_STARTED_TOPIC:
+                # data: burnedAmount, gameType, timestamp
+                started["game_id"].append(game_id)
+                started["block"].append(log["blockNumber"])
+                started["burned"].append(int.from_bytes(data[0:32], "big") / WEI)
+                started["game_type"].append(data[63])
+            else:
+                # data: outcome, rewardAmount, aiMessage offset, timestamp, ...
+                completed["game_id"].append(game_id)
+                completed["block"].append(log["blockNumber"])
+                completed["outcome"].append(data[31])
+                completed["reward"].append(int.from_bytes(data[32:64], "big") / WEI)
+        print(f"📦 Blocks {start}-{end}: {len(started['game_id'])} started, {len(completed['game_id'])} completed")
+
+    return History(
+        np.array(started["game_id"], dtype=np.uint64),
+        np.array(started["block"], dtype=np.uint64),
+        np.array(started["burned"], dtype=np.float64),
+        np.array(started["game_type"], dtype=np.int8),
+        np.array(completed["game_id"], dtype=np.uint64),
+        np.array(completed["outcome"], dtype=np.int8),
+        np.array(completed["reward"], dtype=np.float64),
+    )
+
+
+class History:
+    """Per-game columns: one row per GameStarted, joined with its GameCompleted if any"""
+
+    def __init__(self, game_id, block, burned, game_type, completed_id, completed_outcome, completed_reward):
+        order = np.argsort(block, kind="stable")
+        self.game_id = game_id[order]
+        self.block = block[order]
+        self.burned = burned[order]
+        self.game_type = game_type[order]
+
+        # Vectorized join on gameId via a sorted index into the completions
+        self.outcome = np.full(len(self.game_id), NO_OUTCOME, dtype=np.int8)
+        self.reward = np.zeros(len(self.game_id), dtype=np.float64)
+        if len(completed_id):
+            by_id = np.argsort(completed_id)
+            sorted_ids = completed_id[by_id]
+            pos = np.clip(np.searchsorted(sorted_ids, self.game_id), 0, len(sorted_ids) - 1)
+            matched = sorted_ids[pos] == self.game_id
+            self.outcome[matched] = completed_outcome[by_id[pos[matched]]]
+            self.reward[matched] = completed_reward[by_id[pos[matched]]]
+
+    def __len__(self):
+        return len(self.game_id)
+
+    @property
+    def completed(self):
+        return self.outcome != NO_OUTCOME
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            game_id=self.game_id, block=self.block, burned=self.burned, game_type=self.game_type,
+            completed_id=self.game_id[self.completed], completed_outcome=self.outcome[self.completed],
+            completed_reward=self.reward[self.completed],
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["game_id"], data["block"], data["burned"], data["game_type"],
+                   data["completed_id"], data["completed_outcome"], data["completed_reward"])
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Vectorized Wilson score interval for binomial proportions"""
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.maximum(np.asarray(trials, dtype=np.float64), 1)
+    p = successes / trials
+    denom = 1 + z**2 / trials
+    centre = (p + z**2 / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denom
+    return centre - half, centre + half
+
+
+def outcome_frequencies(history):
+    """(n_types, 4) outcome counts for completed games, with 95% Wilson intervals"""
+    done = history.completed
+    types = history.game_type[done].astype(np.int64)
+    n_types = max(len(GAME_TYPE_NAMES), int(types.max()) + 1 if len(types) else 0)
+    flat = types * len(OUTCOME_NAMES) + history.outcome[done].astype(np.int64)
+    counts = np.bincount(flat, minlength=n_types * len(OUTCOME_NAMES)).reshape(n_types, len(OUTCOME_NAMES))
+    totals = counts.sum(axis=1, keepdims=True)
+    low, high = wilson_interval(counts, totals)
+    return counts, totals[:, 0], low, high
+
+
+def payout_ratio(history, z=Z_95):
+    """AVAX paid per BBT burned, per game type, with delta-method 95% intervals"""
+    done = history.completed
+    results = {}
+    for game_type in np.unique(history.game_type[done]):
+        mask = done & (history.game_type == game_type)
+        burned = history.burned[mask]
+        reward = history.reward[mask]
+        n = len(burned)
+        mean_burned = burned.mean()
+        ratio = reward.sum() / burned.sum() if mean_burned else 0.0
+        # Ratio estimator variance: Var(reward - ratio * burned) / (n * mean_burned^2)
+        residual = reward - ratio * burned
+        stderr = np.sqrt(residual.var(ddof=1) / n) / mean_burned if n > 1 and mean_burned else 0.0
+        results[int(game_type)] = (ratio, ratio - z * stderr, ratio + z * stderr, n)
+    return results
+
+
+def drawdown(history, windows=(100, 1000, 10000)):
+    """Cumulative AVAX paid in block order and the worst payout over any N consecutive games"""
+    paid = history.reward[history.completed]
+    curve = np.cumsum(paid)
+    worst = {}
+    for window in windows:
+        if len(paid) >= window:
+            padded = np.concatenate(([0.0], curve))
+            worst[window] = float((padded[window:] - padded[:-window]).max())
+    return curve, worst
+
+
+def load_game_configs(w3, contract_address):
+    """The contract's current gameConfigs, as read by the bot's reward quotes"""
+    quotes = RewardQuoteEngine(w3.eth.contract(address=contract_address, abi=GAME_CONFIGS_ABI))
+    quotes.refresh()
+    return quotes.configs
+
+
+def payout_matrix(history, configs):
+    """
+    (games, outcomes) AVAX each game would pay for each outcome under the contract's
+    reward formula (reward_quotes.calculate_reward), so outcomes that never happened in
+    history and AI_VICTORY's flat base/10 are priced correctly
+    """
+    payouts = np.zeros((len(history), len(OUTCOME_NAMES)))
+    for game_type, config in configs.items():
+        mask = history.game_type == game_type
+        # burned is in BBT, so burned_wei * rewardPerToken / 1e18 == burned * rewardPerToken
+        full = (config.base_reward_wei + history.burned[mask] * config.reward_per_token) / WEI
+        payouts[mask, PLAYER_VICTORY] = full
+        payouts[mask, AI_VICTORY] = (config.base_reward_wei // 10) / WEI
+        payouts[mask, DRAW] = full / 2
+        payouts[mask, EPIC_VICTORY] = full * 2
+    return payouts
+
+
+def simulate(history, odds, payouts, trials=1000, seed=0, max_cells=4_000_000):
+    """
+    Monte Carlo: replay the real burn/type sequence `trials` times under `odds`,
+    paying each game payouts[game, outcome]. Returns AVAX paid per BBT per trial
+    and the overall outcome shares. Trials run in blocks of at most `max_cells` draws.
+    """
+    rng = np.random.default_rng(seed)
+    burned = history.burned
+    types = history.game_type.astype(np.int64)
+
+    win_rate = np.full(len(burned), odds.get("default_win_rate", 0.5))
+    for game_type, rate in odds["win_rates"].items():
+        win_rate[types == int(game_type)] = rate
+    applied = np.zeros(len(burned), dtype=bool)
+    for threshold, factor in odds.get("burn_tiers", []):
+        tier = (burned > threshold) & ~applied
+        win_rate[tier] *= factor
+        applied |= tier
+
+    ai_cut = win_rate
+    draw_cut = ai_cut + odds["draw"]
+    epic_cut = draw_cut + odds["epic"]
+    total_burned = burned.sum()
+
+    ratios = np.empty(trials)
+    outcome_counts = np.zeros(len(OUTCOME_NAMES), dtype=np.int64)
+    block = max(1, max_cells // max(len(burned), 1))
+    for first in range(0, trials, block):
+        count = min(block, trials - first)
+        draws = rng.random((count, len(burned)))
+        outcomes = np.select(
+            [draws < ai_cut, draws < draw_cut, draws < epic_cut],
+            [1, 2, 3],
+            default=0,
+        )
+        paid = payouts[np.arange(len(burned)), outcomes]
+        ratios[first:first + count] = paid.sum(axis=1) / total_burned
+        outcome_counts += np.bincount(outcomes.ravel(), minlength=len(OUTCOME_NAMES))
+    return ratios, outcome_counts / outcome_counts.sum()
+
+
+def report(history):
+    print(f"\n📊 {len(history):,} games, {int(history.completed.sum()):,} completed")
+
+    counts, totals, low, high = outcome_frequencies(history)
+    print("\n🎯 Outcome frequencies (95% Wilson interval)")
+    for game_type, total in enumerate(totals):
+        if not total:
+            continue
+        name = GAME_TYPE_NAMES[game_type] if game_type < len(GAME_TYPE_NAMES) else f"TYPE_{game_type}"
+        print(f"  {name} ({total:,} games)")
+        for outcome, outcome_name in enumerate(OUTCOME_NAMES):
+            share = counts[game_type, outcome] / total
+            print(f"    - {outcome_name:15s} {share:6.1%}  [{low[game_type, outcome]:.1%}, {high[game_type, outcome]:.1%}]")
+
+    print("\n💰 AVAX paid per BBT burned (95% interval)")
+    for game_type, (ratio, low_ci, high_ci, n) in payout_ratio(history).items():
+        name = GAME_TYPE_NAMES[game_type] if game_type < len(GAME_TYPE_NAMES) else f"TYPE_{game_type}"
+        print(f"  - {name:13s} {ratio:.8f}  [{low_ci:.8f}, {high_ci:.8f}]  ({n:,} games)")
+
+    curve, worst = drawdown(history)
+    total_paid = curve[-1] if len(curve) else 0.0
+    print(f"\n📉 Pool drawdown: {total_paid:.6f} AVAX paid in total")
+    for window, amount in worst.items():
+        print(f"  - Worst {window:,} consecutive games: {amount:.6f} AVAX")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BigBrain Battle payout analytics")
+    parser.add_argument("--rpc-url", default=RPC_URL)
+    parser.add_argument("--contract", default=GAME_CONTRACT_ADDRESS)
+    parser.add_argument("--from-block", type=int)
+    parser.add_argument("--to-block", type=int)
+    parser.add_argument("--cache", help="npz file to load history from / save it to")
+    parser.add_argument("--simulate", help="JSON odds table to Monte Carlo against real burns ('default' for the bot's)")
+    parser.add_argument("--trials", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.cache and os.path.exists(args.cache) and args.from_block is None:
+        history = History.load(args.cache)
+    else:
+        if args.from_block is None:
+            parser.error("--from-block is required when there is no cache to load")
+        w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+        to_block = args.to_block if args.to_block is not None else w3.eth.block_number
+        history = fetch_history(w3, w3.to_checksum_address(args.contract), args.from_block, to_block)
+        if args.cache:
+            history.save(args.cache)
+
+    start = time.perf_counter()
+    report(history)
+
+    if args.simulate:
+        odds = DEFAULT_ODDS
+        if args.simulate != "default":
+            with open(args.simulate) as f:
+                odds = json.load(f)
+        # Payouts come from the contract's current reward parameters, not from history
+        w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+        payouts = payout_matrix(history, load_game_configs(w3, w3.to_checksum_address(args.contract)))
+        ratios, shares = simulate(history, odds, payouts, trials=args.trials)
+        low_ci, mid, high_ci = np.percentile(ratios, [2.5, 50, 97.5])
+        print(f"\n🎲 Monte Carlo ({args.trials:,} trials of {len(history):,} games)")
+        print(f"  - AVAX per BBT: {mid:.8f}  [{low_ci:.8f}, {high_ci:.8f}]")
+        for outcome, share in enumerate(shares):
+            print(f"  - {OUTCOME_NAMES[outcome]:15s} {share:6.1%}")
+
+    print(f"\n⏱️ Analysis took {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
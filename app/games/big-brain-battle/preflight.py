@@ -0,0 +1,217 @@
+"""
+Batched pre-flight simulation of completeGame calls for the BigBrain Battle bot
+A whole batch is simulated in one eth_call: a tiny batch-caller contract is placed
+at the bot's own address with a state override, so every inner call still comes
+from the owner, and it reports success, gas used and return/revert data per call
+"""
+
+from eth_abi import decode
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+PANIC_SELECTOR = bytes.fromhex("4e487b71")  # Panic(uint256)
+
+# Node errors that mean "no state overrides here" rather than "your call reverted"
+OVERRIDE_UNSUPPORTED_HINTS = ("invalid params", "too many arguments", "state override",
+                              "unsupported", "not supported", "unknown field", "sender not an eoa")
+
+_OPCODES = {
+    "STOP": 0x00, "ADD": 0x01, "SUB": 0x03, "GT": 0x11, "ISZERO": 0x15, "AND": 0x16,
+    "NOT": 0x19, "SHR": 0x1C, "CALLDATALOAD": 0x35, "CALLDATASIZE": 0x36,
+    "CALLDATACOPY": 0x37, "RETURNDATASIZE": 0x3D, "RETURNDATACOPY": 0x3E, "POP": 0x50,
+    "MSTORE": 0x52, "JUMP": 0x56, "JUMPI": 0x57, "GAS": 0x5A, "JUMPDEST": 0x5B,
+    "CALL": 0xF1, "RETURN": 0xF3,
+}
+
+
+def assemble(program):
+    """
+    Assemble a list of mnemonics into EVM bytecode. ("PUSH1", n) pushes a constant,
+    ("PUSH2", "label") a jump target, ("LABEL", name) marks a JUMPDEST.
+    """
+    labels = {}
+    offset = 0
+    for op in program:
+        if isinstance(op, tuple) and op[0] == "LABEL":
+            labels[op[1]] = offset
+            offset += 1
+        elif isinstance(op, tuple):
+            offset += 1 + int(op[0][4:])
+        else:
+            offset += 1
+
+    code = bytearray()
+    for op in program:
+        if isinstance(op, tuple) and op[0] == "LABEL":
+            code.append(_OPCODES["JUMPDEST"])
+        elif isinstance(op, tuple):
+            size = int(op[0][4:])
+            value = labels[op[1]] if isinstance(op[1], str) else op[1]
+            code.append(0x5F + size)
+            code += value.to_bytes(size, "big")
+        elif op.startswith("DUP"):
+            code.append(0x7F + int(op[3:]))
+        elif op.startswith("SWAP"):
+            code.append(0x8F + int(op[4:]))
+        else:
+            code.append(_OPCODES[op])
+    return bytes(code)
+
+
+# Input: repeated  target (20 bytes) | length (32 bytes) | calldata (length bytes)
+# Output: repeated success (32) | gas used (32) | return size (32) | return data (padded to 32)
+# Each call's input is copied to where its output record will go, then overwritten by
+# the return data, so memory only ever grows as far as the output. Stack: [in, out].
+BATCH_CALLER_PROGRAM = [
+    ("PUSH1", 0), ("PUSH1", 0),
+    ("LABEL", "loop"),
+    "DUP1", "CALLDATASIZE", "GT", "ISZERO", ("PUSH2", "done"), "JUMPI",
+    "DUP1", "CALLDATALOAD", ("PUSH1", 0x60), "SHR",                 # [target, in, out]
+    "DUP2", ("PUSH1", 0x14), "ADD", "CALLDATALOAD",                  # [len, target, in, out]
+    "DUP1", "DUP4", ("PUSH1", 0x34), "ADD", "DUP6", ("PUSH1", 0x60), "ADD",
+    "CALLDATACOPY",                                                  # calldata -> out+96
+    "GAS",                                                           # [g0, len, target, in, out]
+    ("PUSH1", 0), ("PUSH1", 0), "DUP4", "DUP8", ("PUSH1", 0x60), "ADD",
+    ("PUSH1", 0), "DUP8", "GAS", "CALL",                             # [ok, g0, len, target, in, out]
+    "GAS", "DUP3", "SUB",                                            # [used, ok, g0, len, target, in, out]
+    "DUP2", "DUP8", "MSTORE",
+    "DUP7", ("PUSH1", 0x20), "ADD", "MSTORE",                        # [ok, g0, len, target, in, out]
+    "RETURNDATASIZE", "DUP7", ("PUSH1", 0x40), "ADD", "MSTORE",
+    "RETURNDATASIZE", ("PUSH1", 0), "DUP8", ("PUSH1", 0x60), "ADD", "RETURNDATACOPY",
+    "POP", "POP", "SWAP1", "POP",                                    # [len, in, out]
+    ("PUSH1", 0x34), "ADD", "ADD", "SWAP1",                          # [out, in']
+    "RETURNDATASIZE", ("PUSH1", 0x1F), "ADD", ("PUSH1", 0x1F), "NOT", "AND",
+    "ADD", ("PUSH1", 0x60), "ADD", "SWAP1",                          # [in', out']
+    ("PUSH2", "loop"), "JUMP",
+    ("LABEL", "done"),
+    "POP", ("PUSH1", 0), "RETURN",
+]
+BATCH_CALLER_CODE = assemble(BATCH_CALLER_PROGRAM)
+
+
+def intrinsic_gas(data):
+    """Base transaction cost plus calldata cost, on top of execution gas"""
+    zeros = data.count(0)
+    return 21000 + 4 * zeros + 16 * (len(data) - zeros)
+
+
+def decode_revert(data):
+    """Human-readable revert reason from raw revert data"""
+    data = bytes(data)
+    if not data:
+        return "execution reverted"
+    if data[:4] == ERROR_SELECTOR:
+        try:
+            return "execution reverted: " + decode(["string"], data[4:])[0]
+        except Exception:
+            pass
+    if data[:4] == PANIC_SELECTOR and len(data) >= 36:
+        return f"execution reverted: panic 0x{int.from_bytes(data[4:36], 'big'):02x}"
+    return "execution reverted: 0x" + data.hex()
+
+
+def revert_reason_from_error(error):
+    """The revert reason carried by a failed estimate_gas/call, without another RPC"""
+    data = getattr(error, "data", None)
+    if isinstance(data, str) and data.startswith("0x") and len(data) > 2:
+        return decode_revert(bytes.fromhex(data[2:]))
+    message = getattr(error, "message", None) or str(error)
+    return message
+
+
+class PreflightResult:
+    """Outcome of simulating one call"""
+
+    __slots__ = ("success", "gas_used", "revert_reason", "return_data")
+
+    def __init__(self, success, gas_used, revert_reason="", return_data=b""):
+        self.success = success
+        self.gas_used = gas_used
+        self.revert_reason = revert_reason
+        self.return_data = return_data
+
+    def __repr__(self):
+        if self.success:
+            return f"PreflightResult(ok, gas_used={self.gas_used})"
+        return f"PreflightResult(reverted: {self.revert_reason!r})"
+
+
+def encode_batch(calls):
+    return b"".join(
+        bytes.fromhex(target[2:]) + len(data).to_bytes(32, "big") + data
+        for target, data in calls
+    )
+
+
+def split_batch(data):
+    """Inverse of encode_batch: the (target, calldata) calls in a batch's input"""
+    data = bytes(data)
+    calls = []
+    offset = 0
+    while offset + 52 <= len(data):
+        size = int.from_bytes(data[offset + 20:offset + 52], "big")
+        calls.append(("0x" + data[offset:offset + 20].hex(), data[offset + 52:offset + 52 + size]))
+        offset += 52 + size
+    return calls
+
+
+def decode_batch(output, count):
+    output = bytes(output)
+    results = []
+    offset = 0
+    for _ in range(count):
+        success = int.from_bytes(output[offset:offset + 32], "big") == 1
+        gas_used = int.from_bytes(output[offset + 32:offset + 64], "big")
+        size = int.from_bytes(output[offset + 64:offset + 96], "big")
+        data = output[offset + 96:offset + 96 + size]
+        offset += 96 + -(-size // 32) * 32
+        results.append(PreflightResult(success, gas_used, "" if success else decode_revert(data), data))
+    return results
+
+
+class BatchSimulator:
+    """
+    Simulates a batch of (target, calldata) calls from `sender`. Calls run in order
+    inside one eth_call, so each sees the state left by the previous ones (a burst
+    that would drain the reward pool fails on the game that drains it). Nodes without
+    state overrides fall back to one eth_estimateGas per call.
+    """
+
+    def __init__(self, w3, sender):
+        self.w3 = w3
+        self.sender = sender
+        self.supports_overrides = None  # Unknown until the first batch
+        self.batches = 0
+        self.simulated = 0
+
+    def simulate(self, calls):
+        """Return one PreflightResult per (target, calldata) call"""
+        if not calls:
+            return []
+        self.batches += 1
+        self.simulated += len(calls)
+
+        if self.supports_overrides is not False:
+            try:
+                output = self.w3.eth.call(
+                    {'from': self.sender, 'to': self.sender, 'data': encode_batch(calls)},
+                    'latest',
+                    {self.sender: {'code': '0x' + BATCH_CALLER_CODE.hex()}},
+                )
+                self.supports_overrides = True
+                return decode_batch(output, len(calls))
+            except Exception as e:
+                if self.supports_overrides or not any(
+                    hint in str(e).lower() for hint in OVERRIDE_UNSUPPORTED_HINTS
+                ):
+                    raise
+                self.supports_overrides = False
+
+        return [self._simulate_one(target, data) for target, data in calls]
+
+    def _simulate_one(self, target, data):
+        try:
+            gas = self.w3.eth.estimate_gas({'from': self.sender, 'to': target, 'data': data})
+        except Exception as e:
+            return PreflightResult(False, 0, revert_reason_from_error(e))
+        # estimate_gas includes the intrinsic cost; report execution gas like the batch path
+        return PreflightResult(True, max(0, gas - intrinsic_gas(data)))
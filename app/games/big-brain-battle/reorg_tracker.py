@@ -0,0 +1,72 @@
+"""
+Reorg detection for the BigBrain Battle bot
+Remembers the block hash of every log/receipt the bot acted on and checks them
+against the canonical chain as new blocks arrive
+"""
+
+STARTED = "started"
+COMPLETED = "completed"
+
+
+class ReorgTracker:
+    """Watches recent block hashes until they are deeper than `depth` blocks"""
+
+    def __init__(self, w3, depth=32):
+        self.w3 = w3
+        self.depth = depth
+        # block_number -> (block_hash, {game_id: kind})
+        self._watched = {}
+        self.reorgs_detected = 0
+
+    def __len__(self):
+        return len(self._watched)
+
+    def watch(self, block_number, block_hash, game_id, kind):
+        """Remember that `game_id` depends on `block_hash` being canonical"""
+        block_hash = bytes(block_hash)
+        entry = self._watched.get(block_number)
+        if entry is None or entry[0] != block_hash:
+            entry = (block_hash, {})
+            self._watched[block_number] = entry
+        entry[1][game_id] = kind
+
+    def _canonical_hash(self, block_number):
+        return bytes(self.w3.eth.get_block(block_number)["hash"])
+
+    def check(self, head):
+        """
+        Compare watched blocks against the canonical chain at `head`.
+        Returns (fork_block, orphaned) where orphaned is a list of (game_id, kind, block_number).
+        fork_block is the first block that may differ from what we saw - the block after the
+        highest watched block that is still canonical, since orphaned txs can be re-included
+        anywhere above it - and None when nothing was reorged.
+        """
+        # Anything deeper than `depth` is treated as final and forgotten
+        final = head - self.depth
+        for number in [n for n in self._watched if n <= final]:
+            del self._watched[number]
+
+        if not self._watched:
+            return None, []
+
+        # Block hashes commit to their parents, so if the highest watched block is
+        # still canonical every lower one is too - one RPC per poll in the common case
+        numbers = sorted(self._watched, reverse=True)
+        orphaned = []
+        # If no watched block survived, everything above the finality horizon is suspect
+        canonical_block = final
+
+        for number in numbers:
+            block_hash, games = self._watched[number]
+            if self._canonical_hash(number) == block_hash:
+                canonical_block = number
+                break
+
+            for game_id, kind in games.items():
+                orphaned.append((game_id, kind, number))
+            del self._watched[number]
+
+        if not orphaned:
+            return None, []
+        self.reorgs_detected += 1
+        return max(canonical_block + 1, 0), orphaned
@@ -0,0 +1,207 @@
+"""
+Retry scheduling for games the BigBrain Battle bot failed to complete
+Failures are classified, retried with per-class backoff and parked in a
+dead-letter list once they are permanent or out of attempts
+"""
+
+import heapq
+import json
+import os
+import time
+
+# Failure classes
+POOL_EMPTY = "pool_empty"
+ALREADY_COMPLETED = "already_completed"
+NONCE = "nonce"
+FEE = "fee"
+RPC_TRANSIENT = "rpc_transient"
+REORGED = "reorged"
+REVERTED = "reverted"
+UNKNOWN = "unknown"
+
+# Substrings (lower-cased) that identify each class, checked in order
+FAILURE_PATTERNS = [
+    (POOL_EMPTY, ("insufficient avax reward pool", "insufficient reward pool")),
+    (ALREADY_COMPLETED, ("already completed", "game not active", "game already", "invalid game state")),
+    (NONCE, ("nonce too low", "nonce too high", "already known", "replacement transaction")),
+    (FEE, ("underpriced", "max fee per gas", "base fee", "insufficient funds for gas")),
+    (RPC_TRANSIENT, ("timeout", "timed out", "connection", "too many requests", "rate limit",
+                     "429", "502", "503", "504", "is not in the chain after")),
+    (REVERTED, ("execution reverted", "revert")),
+]
+
+# failure class -> (base delay seconds, max attempts); max attempts 0 means never retry
+RETRY_POLICIES = {
+    POOL_EMPTY: (60.0, 10),     # Wait for someone to top the pool up
+    ALREADY_COMPLETED: (0.0, 0),
+    NONCE: (1.0, 5),            # Re-read the nonce and go again almost immediately
+    FEE: (5.0, 5),
+    RPC_TRANSIENT: (2.0, 8),
+    REORGED: (6.0, 3),          # A few blocks, so the rescan can see the orphaned tx re-included
+    REVERTED: (10.0, 2),
+    UNKNOWN: (10.0, 3),
+}
+
+
+def classify_failure(error):
+    """Map an exception or error message to a failure class"""
+    message = str(error).lower()
+    if type(error).__name__ in ("TimeExhausted", "Timeout", "ReadTimeout", "ConnectionError"):
+        return RPC_TRANSIENT
+    for failure_class, patterns in FAILURE_PATTERNS:
+        if any(pattern in message for pattern in patterns):
+            return failure_class
+    return UNKNOWN
+
+
+class RetryEntry:
+    """A game waiting for another completion attempt (or parked as a dead letter)"""
+
+    __slots__ = ("game_id", "game_type", "burned_amount", "failure_class", "attempts",
+                 "last_error", "next_attempt_at")
+
+    def __init__(self, game_id, game_type, burned_amount):
+        self.game_id = game_id
+        self.game_type = game_type
+        self.burned_amount = burned_amount
+        self.failure_class = UNKNOWN
+        self.attempts = 0
+        self.last_error = ""
+        self.next_attempt_at = 0.0
+
+    def to_dict(self):
+        return {
+            "gameId": self.game_id,
+            "gameType": self.game_type,
+            "burnedAmount": str(self.burned_amount),
+            "failureClass": self.failure_class,
+            "attempts": self.attempts,
+            "lastError": self.last_error,
+        }
+
+
+class RetryQueue:
+    """Min-heap of games due for retry plus an operator-visible dead-letter list"""
+
+    def __init__(self, max_retries_per_poll=2, dead_letter_path=None, clock=time.time):
+        self.max_retries_per_poll = max_retries_per_poll
+        self.dead_letter_path = dead_letter_path
+        self._clock = clock
+        self._heap = []  # (next_attempt_at, seq, game_id)
+        self._seq = 0
+        self._pending = {}  # game_id -> RetryEntry
+        self._dead = {}  # game_id -> RetryEntry
+        self._load_dead_letters()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, game_id):
+        return game_id in self._pending
+
+    def record_failure(self, game_id, game_type, burned_amount, error, failure_class=None):
+        """
+        Register a failed completion. Returns the failure class; the game is scheduled
+        for retry, dropped (already completed) or moved to the dead-letter list.
+        """
+        failure_class = failure_class or classify_failure(error)
+        entry = self._pending.pop(game_id, None) or RetryEntry(game_id, game_type, burned_amount)
+        entry.failure_class = failure_class
+        entry.attempts += 1
+        entry.last_error = str(error)[:500]
+
+        base_delay, max_attempts = RETRY_POLICIES[failure_class]
+        if failure_class == ALREADY_COMPLETED:
+            return failure_class
+        if entry.attempts > max_attempts:
+            self._dead[game_id] = entry
+            self._save_dead_letters()
+            return failure_class
+
+        entry.next_attempt_at = self._clock() + base_delay * 2 ** (entry.attempts - 1)
+        self._push(entry)
+        return failure_class
+
+    def _push(self, entry):
+        self._pending[entry.game_id] = entry
+        self._seq += 1
+        heapq.heappush(self._heap, (entry.next_attempt_at, self._seq, entry.game_id))
+
+    def discard(self, game_id):
+        """Stop retrying a game, e.g. because it turned up completed"""
+        self._pending.pop(game_id, None)
+
+    def due(self):
+        """Pop at most `max_retries_per_poll` entries whose backoff has elapsed"""
+        now = self._clock()
+        ready = []
+        while self._heap and len(ready) < self.max_retries_per_poll:
+            next_at, _, game_id = self._heap[0]
+            if next_at > now:
+                break
+            heapq.heappop(self._heap)
+            entry = self._pending.get(game_id)
+            # Skip stale heap slots left behind by rescheduling or discard()
+            if entry is None or entry.next_attempt_at != next_at:
+                continue
+            del self._pending[game_id]
+            ready.append(entry)
+        return ready
+
+    def pending(self):
+        """Games waiting for a retry, with the seconds left on their backoff"""
+        now = self._clock()
+        return [
+            {**entry.to_dict(), "retryIn": max(0.0, entry.next_attempt_at - now)}
+            for entry in self._pending.values()
+        ]
+
+    def restore(self, items):
+        """Re-queue entries exported by pending(), e.g. by the instance we took over from"""
+        now = self._clock()
+        for item in items:
+            entry = RetryEntry(item["gameId"], item["gameType"], int(item["burnedAmount"]))
+            entry.failure_class = item["failureClass"]
+            entry.attempts = item["attempts"]
+            entry.last_error = item["lastError"]
+            entry.next_attempt_at = now + item.get("retryIn", 0.0)
+            self._push(entry)
+
+    def dead_letters(self):
+        """Dead-lettered games for operator inspection"""
+        return [entry.to_dict() for entry in list(self._dead.values())]
+
+    def replay(self, game_ids=None):
+        """Move dead letters (all, or the given gameIds) back onto the retry queue"""
+        game_ids = list(self._dead) if game_ids is None else game_ids
+        replayed = []
+        for game_id in game_ids:
+            entry = self._dead.pop(game_id, None)
+            if entry is None:
+                continue
+            entry.attempts = 0
+            entry.next_attempt_at = self._clock()
+            self._push(entry)
+            replayed.append(game_id)
+        if replayed:
+            self._save_dead_letters()
+        return replayed
+
+    def _save_dead_letters(self):
+        if not self.dead_letter_path:
+            return
+        tmp_path = self.dead_letter_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.dead_letters(), f, indent=2)
+        os.replace(tmp_path, self.dead_letter_path)
+
+    def _load_dead_letters(self):
+        if not self.dead_letter_path or not os.path.exists(self.dead_letter_path):
+            return
+        with open(self.dead_letter_path) as f:
+            for item in json.load(f):
+                entry = RetryEntry(item["gameId"], item["gameType"], int(item["burnedAmount"]))
+                entry.failure_class = item["failureClass"]
+                entry.attempts = item["attempts"]
+                entry.last_error = item["lastError"]
+                self._dead[entry.game_id] = entry
@@ -0,0 +1,112 @@
+"""
+Local AVAX reward quotes for the BigBrain Battle bot
+Mirrors GameBurnManager._calculateAvaxReward from the contract's gameConfigs,
+read once and refreshed on GameConfigUpdated, so a quote is a dict lookup
+instead of an eth_call
+"""
+
+import random
+from collections import OrderedDict
+
+# GameOutcome enum
+PLAYER_VICTORY = 0
+AI_VICTORY = 1
+DRAW = 2
+EPIC_VICTORY = 3
+
+GAME_TYPES = (0, 1, 2)  # QUICK_BATTLE, ARENA_FIGHT, BOSS_BATTLE
+WEI_PER_TOKEN = 10**18
+
+
+class GameConfig:
+    """The reward-relevant part of a gameConfigs(gameType) entry"""
+
+    __slots__ = ("min_burn_amount", "base_reward_wei", "reward_per_token", "win_probability", "enabled")
+
+    def __init__(self, min_burn_amount, base_reward_wei, reward_per_token, win_probability, enabled):
+        self.min_burn_amount = min_burn_amount
+        self.base_reward_wei = base_reward_wei
+        self.reward_per_token = reward_per_token
+        self.win_probability = win_probability
+        self.enabled = enabled
+
+
+def calculate_reward(config, burn_amount, outcome):
+    """Integer-exact port of _calculateAvaxReward"""
+    if outcome == AI_VICTORY:
+        return config.base_reward_wei // 10
+    full_reward = config.base_reward_wei + (burn_amount * config.reward_per_token) // WEI_PER_TOKEN
+    if outcome == PLAYER_VICTORY:
+        return full_reward
+    if outcome == DRAW:
+        return full_reward // 2
+    if outcome == EPIC_VICTORY:
+        return full_reward * 2
+    # The contract reverts converting an out-of-range GameOutcome
+    raise ValueError(f"Invalid outcome: {outcome}")
+
+
+class RewardQuoteEngine:
+    """Memoized local quotes for one game contract, with a drift check against call()"""
+
+    def __init__(self, contract, game_types=GAME_TYPES, cache_size=4096):
+        self.contract = contract
+        self.game_types = tuple(game_types)
+        self.cache_size = cache_size
+        self.configs = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.drift_detected = 0
+        self._cache = OrderedDict()  # (burned_amount, game_type, outcome) -> wei
+
+    def refresh(self, game_type=None):
+        """Re-read one game type's config (or all of them) and drop its cached quotes"""
+        game_types = self.game_types if game_type is None else (game_type,)
+        for gt in game_types:
+            self.configs[gt] = GameConfig(*self.contract.functions.gameConfigs(gt).call())
+        self._cache = OrderedDict(
+            (key, value) for key, value in self._cache.items() if key[1] not in game_types
+        )
+        self.refreshes += 1
+
+    def quote(self, burned_amount, game_type, outcome):
+        """AVAX reward in wei, identical to calculatePotentialReward(...).call()"""
+        key = (burned_amount, game_type, outcome)
+        reward = self._cache.get(key)
+        if reward is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return reward
+
+        self.misses += 1
+        if not self.configs:
+            self.refresh()
+        config = self.configs.get(game_type)
+        if config is None:
+            raise ValueError(f"Invalid game type: {game_type}")
+        reward = calculate_reward(config, burned_amount, outcome)
+
+        self._cache[key] = reward
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return reward
+
+    def check(self, samples=3, keys=None):
+        """
+        Compare a sample of local quotes against calculatePotentialReward(...).call().
+        Returns [(key, local, on_chain)] for every mismatch; configs are re-read on drift.
+        """
+        keys = list(keys) if keys is not None else random.sample(list(self._cache), min(samples, len(self._cache)))
+        mismatches = []
+        for burned_amount, game_type, outcome in keys:
+            local = self.quote(burned_amount, game_type, outcome)
+            on_chain = self.contract.functions.calculatePotentialReward(
+                burned_amount, game_type, outcome
+            ).call()
+            if local != on_chain:
+                mismatches.append(((burned_amount, game_type, outcome), local, on_chain))
+        if mismatches:
+            self.drift_detected += 1
+            self.refresh()
+        return mismatches
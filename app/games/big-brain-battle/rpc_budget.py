@@ -0,0 +1,205 @@
+"""
+RPC budget management for the BigBrain Battle bot
+Token-bucket rate limiting weighted by per-method compute-unit cost, per-method
+exponential backoff with jitter, and a poll interval that adapts to block time
+and recent game traffic
+"""
+
+import random
+import threading
+import time
+
+# Approximate compute-unit cost per JSON-RPC method (Alchemy-style pricing)
+DEFAULT_METHOD_COSTS = {
+    "eth_blockNumber": 10,
+    "eth_chainId": 0,
+    "eth_gasPrice": 19,
+    "eth_getBalance": 19,
+    "eth_getBlockByNumber": 16,
+    "eth_getTransactionCount": 26,
+    "eth_getTransactionByHash": 17,
+    "eth_getTransactionReceipt": 15,
+    "eth_call": 26,
+    "eth_estimateGas": 87,
+    "eth_getLogs": 75,
+    "eth_newFilter": 20,
+    "eth_getFilterChanges": 20,
+    "eth_uninstallFilter": 10,
+    "eth_sendRawTransaction": 250,
+}
+DEFAULT_COST = 20
+
+# JSON-RPC error codes / messages that mean "slow down" rather than "your call reverted"
+RATE_LIMIT_CODES = (429, -32005, -32029)
+RATE_LIMIT_HINTS = ("rate limit", "too many requests", "exceeded", "capacity")
+
+
+class TokenBucket:
+    """Classic token bucket; acquire() sleeps until enough tokens have accrued"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, cost):
+        """Take `cost` tokens if available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return True
+            return False
+
+    def acquire(self, cost):
+        """Block until `cost` tokens are available; returns seconds waited"""
+        cost = min(cost, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                delay = (cost - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class MethodBackoff:
+    """Exponential backoff with full jitter, tracked independently per RPC method"""
+
+    def __init__(self, base=0.5, cap=30.0, clock=time.monotonic):
+        self.base = base
+        self.cap = cap
+        self._clock = clock
+        # method -> (consecutive failures, retry-not-before timestamp)
+        self._state = {}
+
+    def delay_for(self, method):
+        """Seconds until `method` may be called again (0 when healthy)"""
+        state = self._state.get(method)
+        if state is None:
+            return 0.0
+        return max(0.0, state[1] - self._clock())
+
+    def failure(self, method):
+        failures = self._state.get(method, (0, 0.0))[0] + 1
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** failures))
+        self._state[method] = (failures, self._clock() + delay)
+        return delay
+
+    def success(self, method):
+        self._state.pop(method, None)
+
+    def failing_methods(self):
+        return {method: state[0] for method, state in list(self._state.items())}
+
+
+class RpcBudget:
+    """Web3 middleware that charges every request against a compute-unit token bucket"""
+
+    def __init__(self, compute_units_per_second=330, burst=None, method_costs=None,
+                 sleep=time.sleep):
+        self.method_costs = dict(DEFAULT_METHOD_COSTS)
+        if method_costs:
+            self.method_costs.update(method_costs)
+        self.bucket = TokenBucket(compute_units_per_second, burst or compute_units_per_second)
+        self.backoff = MethodBackoff()
+        self._sleep = sleep
+        self.calls = {}
+        self.units_spent = 0
+        self.seconds_throttled = 0.0
+
+    def cost(self, method):
+        return self.method_costs.get(method, DEFAULT_COST)
+
+    @staticmethod
+    def _is_rate_limited(error):
+        if isinstance(error, dict):
+            if error.get("code") in RATE_LIMIT_CODES:
+                return True
+            message = str(error.get("message", "")).lower()
+        else:
+            message = str(error).lower()
+        return any(hint in message for hint in RATE_LIMIT_HINTS)
+
+    def middleware(self, make_request, w3):
+        """Entry point for w3.middleware_onion.add(...)"""
+        def budget_middleware(method, params):
+            # Only this method waits out its backoff; healthy methods keep flowing
+            delay = self.backoff.delay_for(method)
+            if delay:
+                self._sleep(delay)
+                self.seconds_throttled += delay
+
+            cost = self.cost(method)
+            self.seconds_throttled += self.bucket.acquire(cost)
+            self.units_spent += cost
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+            try:
+                response = make_request(method, params)
+            except Exception:
+                # Transport-level failure (timeout, connection reset, HTTP 429/5xx)
+                self.backoff.failure(method)
+                raise
+
+            error = response.get("error") if isinstance(response, dict) else None
+            if error and self._is_rate_limited(error):
+                self.backoff.failure(method)
+            else:
+                self.backoff.success(method)
+            return response
+
+        return budget_middleware
+
+
+class AdaptivePollInterval:
+    """Poll about once per block while games are flowing, stretching out when idle"""
+
+    def __init__(self, min_interval=1.0, max_interval=15.0, idle_growth=1.5,
+                 smoothing=0.2, clock=time.monotonic):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_growth = idle_growth
+        self.smoothing = smoothing
+        self._clock = clock
+        self.block_time = 2.0  # Avalanche C-chain target, refined from observations
+        self.event_rate = 0.0  # Exponentially smoothed games per poll
+        self.interval = min_interval
+        self._last_block = None
+        self._last_block_at = None
+
+    def observe(self, block_number, event_count):
+        """Feed the head block and number of games seen in this poll; returns the next sleep"""
+        now = self._clock()
+        if self._last_block is not None and block_number > self._last_block:
+            seconds_per_block = (now - self._last_block_at) / (block_number - self._last_block)
+            self.block_time += self.smoothing * (seconds_per_block - self.block_time)
+        if self._last_block is None or block_number > self._last_block:
+            self._last_block = block_number
+            self._last_block_at = now
+
+        self.event_rate += self.smoothing * (event_count - self.event_rate)
+
+        if event_count:
+            # Traffic: poll roughly once per block
+            self.interval = self.block_time
+        elif self.event_rate < 0.05:
+            # Quiet: back off geometrically
+            self.interval *= self.idle_growth
+        else:
+            self.interval = max(self.interval, self.block_time)
+
+        self.interval = min(self.max_interval, max(self.min_interval, self.interval))
+        return self.interval
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay RPC cassettes for the BigBrain Battle bot
+CassetteRecorder captures every JSON-RPC request and raw response with timings
+into a gzipped JSON-lines file; CassetteProvider feeds a cassette back to web3 at
+the recorded speed or as fast as possible for offline, deterministic benchmarks
+
+Usage: python rpc_cassette.py info <cassette.jsonl.gz>
+       python rpc_cassette.py replay <cassette.jsonl.gz> [--speed N | --fast] [--seed N]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from eth_utils import keccak
+from web3.providers.base import BaseProvider
+
+from preflight import split_batch
+from tx_signer import COMPLETE_GAME_SIGNATURE
+
+CASSETTE_VERSION = 1
+
+# Sends and simulations are matched on selector + first argument (the gameId), since
+# the AI message and signature differ from run to run
+COMPLETE_GAME_SELECTOR = keccak(text=COMPLETE_GAME_SIGNATURE)[:4].hex()
+CALL_PREFIX_CHARS = 2 + 8 + 64
+
+# Stands in for the bot's own address, which differs between recording and replay
+ACCOUNT_PLACEHOLDER = "0x" + "ac" * 20
+
+# Answers that never change within a session; replayed from any recording once used up
+STATIC_METHODS = ("eth_chainId", "net_version", "web3_clientVersion")
+
+# Wall-clock sleep for simulated latency, captured before a replay patches time.sleep
+_real_sleep = time.sleep
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if hasattr(value, "items"):
+        return dict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=_json_default)
+
+
+def match_key(method, params, accounts=()):
+    """
+    Request identity used to pair live calls with recorded ones. `accounts` (the
+    recording's or the replaying bot's addresses) are replaced by a placeholder wherever
+    they appear, e.g. as `to` and state-override key of a batched pre-flight eth_call
+    """
+    text = _dumps(list(params or ()))
+    for account in accounts:
+        if account:
+            text = re.sub(account[2:], ACCOUNT_PLACEHOLDER[2:], text, flags=re.IGNORECASE)
+    params = json.loads(text)
+    if method == "eth_sendRawTransaction" and params:
+        raw = params[0].lower()
+        at = raw.find(COMPLETE_GAME_SELECTOR)
+        if at >= 0:
+            return method, raw[at:at + CALL_PREFIX_CHARS - 2]
+    for param in params:
+        if isinstance(param, dict):
+            # Drop the sender and trim calldata so any key and AI message still match
+            param.pop("from", None)
+            if method == "eth_call" and param.get("to") == ACCOUNT_PLACEHOLDER and isinstance(param.get("data"), str):
+                # A pre-flight batch: key it on each call's target, selector and gameId
+                calls = split_batch(bytes.fromhex(param["data"][2:]))
+                param["data"] = [target + data.hex()[:CALL_PREFIX_CHARS - 2] for target, data in calls]
+                continue
+            for field in ("data", "input"):
+                if isinstance(param.get(field), str):
+                    param[field] = param[field][:CALL_PREFIX_CHARS]
+    return method, _dumps(params)
+
+
+class CassetteRecorder:
+    """Innermost web3 middleware that appends every raw request/response to a cassette"""
+
+    def __init__(self, path, meta=None, flush_every=64):
+        self.path = path
+        self.flush_every = flush_every
+        self.entries = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        header = {"cassette": CASSETTE_VERSION, "recordedAt": time.time(), "meta": meta or {}}
+        self._file.write(_dumps(header) + "\n")
+
+    def middleware(self, make_request, w3):
+        """Entry point for w3.middleware_onion.inject(..., layer=0)"""
+        def cassette_middleware(method, params):
+            start = time.monotonic()
+            try:
+                response = make_request(method, params)
+            except Exception as e:
+                # Transport failures are replayed as ConnectionError
+                self._write(start, method, params, {"transportError": f"{type(e).__name__}: {e}"})
+                raise
+            self._write(start, method, params, response)
+            return response
+
+        return cassette_middleware
+
+    def _write(self, start, method, params, response):
+        line = _dumps([
+            round(start - self._started, 4),
+            round(time.monotonic() - start, 4),
+            method,
+            list(params or ()),
+            response,
+        ])
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self.entries += 1
+            if self.entries % self.flush_every == 0:
+                # Sync flush so a crashed session still leaves a readable cassette
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class CassetteEntry:
+    """One recorded JSON-RPC exchange"""
+
+    __slots__ = ("at", "duration", "method", "params", "response", "used")
+
+    def __init__(self, at, duration, method, params, response):
+        self.at = at
+        self.duration = duration
+        self.method = method
+        self.params = params
+        self.response = response
+        self.used = False
+
+
+def read_cassette(path):
+    """Return (header, entries); a cassette cut short by a crash is read up to the tear"""
+    header = None
+    entries = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if header is None:
+                    header = json.loads(line)
+                    if header.get("cassette") != CASSETTE_VERSION:
+                        raise ValueError(f"{path} has an unsupported cassette version")
+                    continue
+                try:
+                    entries.append(CassetteEntry(*json.loads(line)))
+                except ValueError:
+                    break  # Torn last line
+        except EOFError:
+            pass
+    if header is None:
+        raise ValueError(f"{path} is not an RPC cassette")
+    return header, entries
+
+
+class CassetteExhausted(Exception):
+    """The bot asked for something the cassette has no recording of"""
+
+
+class CassetteProvider(BaseProvider):
+    """
+    Web3 provider that answers from a cassette. Calls are matched on their
+    identity first and fall back to the next unused recording of the same method;
+    speed=1.0 replays recorded latencies, speed=None answers immediately.
+    Set `accounts` to the replaying bot's address(es) so calls that carry it
+    match the recorded bot's calls.
+    """
+
+    def __init__(self, path, speed=1.0, accounts=()):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.accounts = list(accounts)
+        self.header, self.entries = read_cassette(path)
+        self.exhausted = False
+        self.calls = defaultdict(int)
+        self.fallbacks = defaultdict(int)
+        self.missing = defaultdict(int)
+        self._by_key = defaultdict(deque)
+        self._by_method = defaultdict(deque)
+        self._static = {}
+        recorded_accounts = [self.meta.get("account")]
+        for entry in self.entries:
+            self._by_key[match_key(entry.method, entry.params, recorded_accounts)].append(entry)
+            self._by_method[entry.method].append(entry)
+            if entry.method in STATIC_METHODS:
+                self._static[entry.method] = entry
+
+    @property
+    def meta(self):
+        return self.header.get("meta", {})
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+    @staticmethod
+    def _next_unused(queue):
+        while queue and queue[0].used:
+            queue.popleft()
+        return queue.popleft() if queue else None
+
+    def _take(self, method, params):
+        entry = self._next_unused(self._by_key.get(match_key(method, params, self.accounts), deque()))
+        if entry is None:
+            entry = self._next_unused(self._by_method.get(method, deque()))
+            if entry is not None:
+                self.fallbacks[method] += 1
+        if entry is not None:
+            entry.used = True
+        return entry
+
+    def make_request(self, method, params):
+        self.calls[method] += 1
+        entry = self._take(method, params) or self._static.get(method)
+        if entry is None:
+            self.missing[method] += 1
+            self.exhausted = True
+            raise CassetteExhausted(f"No recorded {method} left in {self.path}")
+
+        if self.speed:
+            _real_sleep(entry.duration / self.speed)
+
+        response = entry.response
+        if isinstance(response, dict) and "transportError" in response:
+            raise ConnectionError(response["transportError"])
+        return response
+
+    def remaining(self):
+        return sum(not entry.used for entry in self.entries)
+
+
+def summarize(entries):
+    """Per-method call counts and latencies for a list of entries"""
+    by_method = defaultdict(list)
+    for entry in entries:
+        by_method[entry.method].append(entry.duration)
+    summary = {}
+    for method, durations in sorted(by_method.items(), key=lambda item: -len(item[1])):
+        durations.sort()
+        summary[method] = {
+            "calls": len(durations),
+            "mean_ms": round(sum(durations) / len(durations) * 1000, 2),
+            "p95_ms": round(durations[int(0.95 * (len(durations) - 1))] * 1000, 2),
+        }
+    return summary
+
+
+@contextmanager
+def replay_clock(provider, speed):
+    """
+    Make the bot's own sleeps (thinking time, poll interval, receipt polling) follow
+    the replay speed too; the first sleep after the cassette runs dry stops the bot
+    """
+    def replay_sleep(seconds):
+        if provider.exhausted:
+            raise KeyboardInterrupt
+        if speed:
+            _real_sleep(seconds / speed)
+
+    time.sleep = replay_sleep
+    try:
+        yield replay_sleep
+    finally:
+        time.sleep = _real_sleep
+
+
+def replay(path, speed=1.0, seed=0, poll_mode="logs"):
+    """Run a fresh SimpleGameBot against a cassette until it runs dry; returns a report"""
+    from eth_account import Account
+    from new_bot import GAME_CONTRACT_ADDRESSES, SimpleGameBot
+
+    account = Account.create()
+    provider = CassetteProvider(path, speed, accounts=[account.address])
+    random.seed(seed)
+
+    # Cassettes without contract metadata were recorded against the default arenas
+    contracts = provider.meta.get("contracts") or GAME_CONTRACT_ADDRESSES
+    started = time.perf_counter()
+    with replay_clock(provider, speed) as replay_sleep:
+        bot = SimpleGameBot(
+            None,
+            account.key,
+            contracts,
+            provider=provider,
+            compute_units_per_second=10**9,  # The recording was already rate limited
+            dead_letter_path=None,
+            journal_path=None,
+            handoff_path=None,
+        )
+        bot.rpc_budget._sleep = replay_sleep  # Replayed rate-limit errors back off in replay time
+        try:
+            bot.listen_for_games(poll_mode=poll_mode)
+        except KeyboardInterrupt:
+            pass  # Ran dry outside the loop's own KeyboardInterrupt handling
+    elapsed = time.perf_counter() - started
+
+    recorded_sends = sum(entry.method == "eth_sendRawTransaction" for entry in provider.entries)
+    return {
+        "seconds": round(elapsed, 3),
+        "recordedSeconds": provider.entries[-1].at if provider.entries else 0.0,
+        "calls": dict(provider.calls),
+        "fallbackMatches": dict(provider.fallbacks),
+        "missing": dict(provider.missing),
+        "unusedRecordings": provider.remaining(),
+        "sends": provider.calls.get("eth_sendRawTransaction", 0),
+        "recordedSends": recorded_sends,
+        "gamesTracked": sum(len(arena.ledger) for arena in bot.arenas.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BigBrain Battle RPC cassettes")
+    parser.add_argument("command", choices=["info", "replay"])
+    parser.add_argument("cassette")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible")
+    parser.add_argument("--seed", type=int, default=0, help="seed for outcome randomness")
+    parser.add_argument("--poll-mode", default="logs", choices=["logs", "filter"])
+    args = parser.parse_args()
+
+    if args.command == "info":
+        header, entries = read_cassette(args.cassette)
+        span = entries[-1].at if entries else 0.0
+        print(f"📼 {args.cassette}: {len(entries):,} calls over {span:.1f}s")
+        for key, value in header.get("meta", {}).items():
+            print(f"  - {key}: {value}")
+        for method, stats in summarize(entries).items():
+            print(f"  {method:32s} {stats['calls']:7d} calls  mean {stats['mean_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms")
+        return
+
+    report = replay(args.cassette, None if args.fast else args.speed, args.seed, args.poll_mode)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
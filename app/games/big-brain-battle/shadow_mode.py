@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Shadow mode for the BigBrain Battle bot
+Runs the full detect -> decide -> quote -> build pipeline on live or recorded
+GameStarted traffic but stops right before send_raw_transaction: nothing is signed
+and no gas is spent. Reports per-stage latency, RPC calls per game and how its
+decisions compare with what the production bot did (its GameCompleted logs)
+
+Usage: python shadow_mode.py live [--duration 600] [--validate-as 0xOWNER] [--odds odds.json]
+       python shadow_mode.py replay <cassette.jsonl.gz> [--speed N | --fast] [--validate-as 0xOWNER]
+"""
+
+import _thread
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+
+from eth_account import Account
+from web3 import Web3
+
+from new_bot import RPC_URL, GAME_CONTRACT_ADDRESSES, SimpleGameBot
+from game_ledger import STATE_COMPLETED
+from preflight import BatchSimulator, intrinsic_gas
+from retry_queue import ALREADY_COMPLETED, classify_failure
+from rpc_cassette import CassetteProvider, replay_clock
+
+STAGES = ("fetch", "detect", "decide", "quote", "validate", "build")
+OUTCOME_NAMES = ["PLAYER_VICTORY", "AI_VICTORY", "DRAW", "EPIC_VICTORY"]
+
+# Gas limit put on shadow transactions when they aren't validated with eth_call
+SHADOW_GAS_LIMIT = 300000
+
+
+class StageTimer:
+    """Wall-clock samples per pipeline stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def run(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+
+    def summary(self):
+        summary = {}
+        for stage in STAGES:
+            durations = sorted(self.samples.get(stage, ()))
+            if not durations:
+                continue
+            summary[stage] = {
+                "calls": len(durations),
+                "mean_ms": round(sum(durations) / len(durations) * 1000, 3),
+                "p50_ms": round(durations[len(durations) // 2] * 1000, 3),
+                "p95_ms": round(durations[int(0.95 * (len(durations) - 1))] * 1000, 3),
+                "max_ms": round(durations[-1] * 1000, 3),
+            }
+        return summary
+
+
+class ShadowGameBot(SimpleGameBot):
+    """
+    SimpleGameBot that decides, quotes and builds every completion but never signs or
+    sends it. GameCompleted logs are recorded as the production bot's decisions instead
+    of cancelling the game, so both sides are compared on the same games. With
+    `validate_as` (the production owner address) each batch is checked with the
+    pre-flight eth_call as that owner.
+    """
+
+    def __init__(self, rpc_url, game_contract_address, validate_as=None, win_rates=None, **kwargs):
+        super().__init__(
+            rpc_url,
+            Account.create().key,  # Only used for nonce/gas-price reads, never to sign
+            game_contract_address,
+            dead_letter_path=None,
+            journal_path=None,
+            handoff_path=None,
+            **kwargs,
+        )
+        self.thinking_time = (0, 0)
+        if win_rates is not None:
+            self.win_rates = win_rates
+        self.stages = StageTimer()
+        self.validator = BatchSimulator(self.w3, self.w3.to_checksum_address(validate_as)) if validate_as else None
+        self.validation = Counter()
+        self.revert_reasons = Counter()
+        self.decisions = {}  # (contract address, gameId) -> (game type, outcome, reward wei)
+        self.production = {}  # (contract address, gameId) -> (outcome, reward wei)
+
+    def _fetch_game_logs(self, from_block, to_block):
+        return self.stages.run("fetch", super()._fetch_game_logs, from_block, to_block)
+
+    def _process_game_event(self, event):
+        return self.stages.run("detect", super()._process_game_event, event)
+
+    def _determine_outcome(self, game_type, burned_amount, arena=None):
+        return self.stages.run("decide", super()._determine_outcome, game_type, burned_amount, arena)
+
+    def _calculate_potential_reward(self, burned_amount, game_type, outcome, arena=None):
+        return self.stages.run("quote", super()._calculate_potential_reward, burned_amount, game_type, outcome, arena)
+
+    def _index_completed_event(self, event):
+        args = event['args']
+        self.production[(event['address'], args['gameId'])] = (args['outcome'], args['rewardAmount'])
+
+    def _preflight_completions(self, jobs, results):
+        if self.validator is None or not jobs:
+            for job in jobs:
+                job['gas_limit'] = SHADOW_GAS_LIMIT
+            return jobs
+
+        try:
+            simulations = self.stages.run(
+                "validate", self.validator.simulate, [(job['arena'].address, job['calldata']) for job in jobs]
+            )
+        except Exception as e:
+            # Still build the batch, so its games are handled instead of stuck in THINKING
+            print(f"🤖 SimpleGameBot: ⚠️ Shadow validation failed for {len(jobs)} games: {e}")
+            self.validation["error"] += len(jobs)
+            for job in jobs:
+                job['gas_limit'] = SHADOW_GAS_LIMIT
+            return jobs
+        for job, simulation in zip(jobs, simulations):
+            if simulation.success:
+                self.validation["ok"] += 1
+                job['gas_limit'] = simulation.gas_used + intrinsic_gas(job['calldata']) + 50000
+                continue
+            # Usually the production bot got there first
+            if classify_failure(simulation.revert_reason) == ALREADY_COMPLETED:
+                self.validation["already_completed"] += 1
+            else:
+                self.validation["reverted"] += 1
+                self.revert_reasons[simulation.revert_reason] += 1
+            job['gas_limit'] = SHADOW_GAS_LIMIT
+        # Build everything either way, so the build stage sees the full load
+        return jobs
+
+    def _send_completions(self, jobs, results):
+        if not jobs:
+            return []
+
+        # The same per-batch reads production does, then stop before signing
+        nonce = self.w3.eth.get_transaction_count(self.account.address)
+        gas_price = self.w3.eth.gas_price
+        for i, job in enumerate(jobs):
+            arena = job['arena']
+            self.stages.run(
+                "build", self.signer.build, arena.address, job['calldata'], nonce + i, job['gas_limit'], gas_price
+            )
+            self.decisions[(arena.address, job['game_id'])] = (job['game_type'], job['outcome'], job['reward'])
+            arena.ledger.update(job['game_id'], state=STATE_COMPLETED)
+            results[(arena.address, job['game_id'])] = True
+            print(f"🤖 SimpleGameBot: 👻 Shadow: game #{job['game_id']} built, not sent")
+        return []
+
+    def report(self, elapsed):
+        """Latency, RPC usage and decision drift for everything seen so far"""
+        decided = len(self.decisions)
+        rpc_calls = sum(self.rpc_budget.calls.values())
+
+        matched = [key for key in self.decisions if key in self.production]
+        shadow_outcomes = Counter()
+        production_outcomes = Counter()
+        shadow_reward = production_reward = agree = 0
+        for key in matched:
+            game_type, outcome, reward = self.decisions[key]
+            production_outcome, production_paid = self.production[key]
+            shadow_outcomes[(game_type, outcome)] += 1
+            production_outcomes[(game_type, production_outcome)] += 1
+            shadow_reward += reward
+            production_reward += production_paid
+            agree += outcome == production_outcome
+
+        distribution = {}
+        for game_type, outcome in sorted(set(shadow_outcomes) | set(production_outcomes)):
+            distribution.setdefault(str(game_type), {})[OUTCOME_NAMES[outcome]] = {
+                "shadow": shadow_outcomes[(game_type, outcome)],
+                "production": production_outcomes[(game_type, outcome)],
+            }
+
+        return {
+            "seconds": round(elapsed, 3),
+            "gamesDecided": decided,
+            "gamesPerSecond": round(decided / elapsed, 3) if elapsed else None,
+            "stages": self.stages.summary(),
+            "rpcCalls": rpc_calls,
+            "rpcCallsPerGame": round(rpc_calls / decided, 2) if decided else None,
+            "rpcCallsByMethod": dict(self.rpc_budget.calls),
+            "validation": dict(self.validation) if self.validator is not None else None,
+            "revertReasons": dict(self.revert_reasons.most_common(10)),
+            "comparison": {
+                "matchedGames": len(matched),
+                "productionOnly": sum(key not in self.decisions for key in self.production),
+                "outcomeAgreement": round(agree / len(matched), 4) if matched else None,
+                "outcomes": distribution,
+                "shadowRewardAvax": float(Web3.from_wei(shadow_reward, 'ether')),
+                "productionRewardAvax": float(Web3.from_wei(production_reward, 'ether')),
+            },
+        }
+
+
+def shadow_live(rpc_url, contracts, duration=None, poll_mode="logs", **options):
+    """Shadow live traffic until Ctrl-C or `duration` seconds; returns the report"""
+    bot = ShadowGameBot(rpc_url, contracts, **options)
+    if duration:
+        timer = threading.Timer(duration, _thread.interrupt_main)
+        timer.daemon = True
+        timer.start()
+    started = time.perf_counter()
+    try:
+        bot.listen_for_games(poll_mode=poll_mode)
+    except KeyboardInterrupt:
+        pass
+    return bot.report(time.perf_counter() - started)
+
+
+def shadow_replay(path, speed=None, seed=0, poll_mode="logs", **options):
+    """Shadow a recorded cassette until it runs dry; returns the report"""
+    provider = CassetteProvider(path, speed)
+    random.seed(seed)
+
+    contracts = provider.meta.get("contracts") or GAME_CONTRACT_ADDRESSES
+    started = time.perf_counter()
+    with replay_clock(provider, speed) as replay_sleep:
+        bot = ShadowGameBot(
+            None,
+            contracts,
+            provider=provider,
+            compute_units_per_second=10**9,  # The recording was already rate limited
+            **options,
+        )
+        bot.rpc_budget._sleep = replay_sleep
+        # Its throwaway account and the validation sender stand in for the recorded bot
+        provider.accounts = [bot.account.address, options.get("validate_as")]
+        try:
+            bot.listen_for_games(poll_mode=poll_mode)
+        except KeyboardInterrupt:
+            pass  # Ran dry outside the loop's own KeyboardInterrupt handling
+    return bot.report(time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BigBrain Battle shadow mode")
+    parser.add_argument("command", choices=["live", "replay"])
+    parser.add_argument("cassette", nargs="?", help="cassette to shadow (replay only)")
+    parser.add_argument("--rpc-url", default=RPC_URL)
+    parser.add_argument("--contract", action="append", help="game contract (repeatable)")
+    parser.add_argument("--duration", type=float, help="seconds to shadow live traffic for")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible")
+    parser.add_argument("--seed", type=int, default=0, help="seed for outcome randomness")
+    parser.add_argument("--poll-mode", default="logs", choices=["logs", "filter"])
+    parser.add_argument("--validate-as", help="production owner address to eth_call completions as")
+    parser.add_argument("--odds", help="JSON odds table to try ({\"win_rates\": {\"0\": 0.4, ...}})")
+    args = parser.parse_args()
+
+    options = {"validate_as": args.validate_as}
+    if args.odds:
+        with open(args.odds) as f:
+            options["win_rates"] = {int(game_type): rate for game_type, rate in json.load(f)["win_rates"].items()}
+
+    if args.command == "live":
+        report = shadow_live(args.rpc_url, args.contract or GAME_CONTRACT_ADDRESSES, args.duration,
+                             args.poll_mode, **options)
+    else:
+        if not args.cassette:
+            parser.error("replay needs a cassette")
+        report = shadow_replay(args.cassette, None if args.fast else args.speed, args.seed,
+                               args.poll_mode, **options)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
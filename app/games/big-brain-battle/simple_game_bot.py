@@ -11,6 +11,8 @@ from datetime import datetime
 from web3 import Web3
 from eth_account import Account
 
+from preflight import revert_reason_from_error
+
 class SimpleGameBot:
     """A simple AI opponent that responds to game challenges"""
     
@@ -183,15 +185,8 @@ class SimpleGameBot:
                 print(f"🤖 SimpleGameBot: ❌ Gas estimation failed: {gas_error}")
                 print(f"🤖 SimpleGameBot: 🔍 This suggests the transaction would fail")
                 
-                # Try to get more specific error info
-                try:
-                    self.game_contract.functions.completeGame(
-                        game_id,
-                        outcome,
-                        ai_message
-                    ).call({'from': self.account.address})
-                except Exception as call_error:
-                    print(f"🤖 SimpleGameBot: 🚨 Call simulation error: {call_error}")
+                # The failed estimate already carries the revert data - no second call needed
+                print(f"🤖 SimpleGameBot: 🚨 Revert reason: {revert_reason_from_error(gas_error)}")
                 
                 return False
             
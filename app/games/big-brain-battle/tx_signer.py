@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Transaction signing service for the BigBrain Battle bot
+Pre-encodes completeGame calldata from a fixed template and signs transactions,
+optionally in batches on a worker process pool so the main loop only handles raw bytes
+Run directly to measure signatures/s per core
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_account import Account
+from eth_utils import keccak
+
+COMPLETE_GAME_SIGNATURE = "completeGame(uint256,uint8,string)"
+
+
+class CompleteGameCalldata:
+    """ABI-encodes completeGame(gameId, outcome, aiMessage) without going through web3"""
+
+    def __init__(self):
+        self.selector = keccak(text=COMPLETE_GAME_SIGNATURE)[:4]
+        # The string is the only dynamic argument, so its offset is always 3 * 32 bytes
+        self._string_offset = (3 * 32).to_bytes(32, "big")
+        self._outcome_padding = bytes(31)
+
+    def encode(self, game_id, outcome, ai_message):
+        """Return calldata bytes for a completeGame call"""
+        message = ai_message.encode("utf-8")
+        padding = -len(message) % 32
+        return b"".join((
+            self.selector,
+            game_id.to_bytes(32, "big"),
+            self._outcome_padding,
+            outcome.to_bytes(1, "big"),
+            self._string_offset,
+            len(message).to_bytes(32, "big"),
+            message,
+            bytes(padding),
+        ))
+
+
+# Per-process signing key, set once by the pool initializer so it isn't pickled per batch
+_worker_account = None
+
+
+def _init_worker(private_key):
+    global _worker_account
+    _worker_account = Account.from_key(private_key)
+
+
+def _sign_chunk(transactions):
+    return [bytes(_worker_account.sign_transaction(txn).rawTransaction) for txn in transactions]
+
+
+class SigningService:
+    """Signs legacy transactions inline (workers=0) or across a process pool"""
+
+    def __init__(self, private_key, chain_id, workers=0):
+        self.account = Account.from_key(private_key)
+        self.chain_id = chain_id
+        self.workers = workers
+        self._pool = None
+        if workers > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(private_key,),
+            )
+
+    def build(self, to, data, nonce, gas, gas_price, value=0):
+        """Assemble an unsigned transaction dict with no RPC or ABI validation"""
+        return {
+            'to': to,
+            'data': data,
+            'value': value,
+            'gas': gas,
+            'gasPrice': gas_price,
+            'nonce': nonce,
+            'chainId': self.chain_id,
+        }
+
+    def sign(self, txn):
+        """Sign a single transaction and return the raw bytes"""
+        if self._pool is not None:
+            return self._pool.submit(_sign_chunk, [txn]).result()[0]
+        return bytes(self.account.sign_transaction(txn).rawTransaction)
+
+    def sign_batch(self, transactions):
+        """Sign many transactions, spreading them over the pool; order is preserved"""
+        if not transactions:
+            return []
+        if self._pool is None:
+            return [self.sign(txn) for txn in transactions]
+
+        chunk_size = -(-len(transactions) // self.workers)
+        chunks = [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+        signed = []
+        for chunk_result in self._pool.map(_sign_chunk, chunks):
+            signed.extend(chunk_result)
+        return signed
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def _benchmark(count=2000):
+    """Report calldata encoding cost and signatures/s inline and per pool worker"""
+    calldata = CompleteGameCalldata()
+    message = "My neural networks have prevailed. Here's a small AVAX consolation. Reward: 0.012345 AVAX."
+    to = "0x7D56425650a0EFf5111c79c39A27319Ca45138a1"
+    key = "0x" + "11" * 32
+
+    start = time.perf_counter()
+    payloads = [calldata.encode(game_id, game_id % 4, message) for game_id in range(count)]
+    encode_seconds = time.perf_counter() - start
+
+    print(f"📊 SigningService benchmark ({count:,} transactions)")
+    print(f"  - Calldata encode: {encode_seconds / count * 1e6:.1f} µs/tx")
+
+    inline = SigningService(key, 43113)
+    transactions = [inline.build(to, data, nonce, 150000, 25 * 10**9) for nonce, data in enumerate(payloads)]
+    start = time.perf_counter()
+    inline.sign_batch(transactions)
+    inline_rate = count / (time.perf_counter() - start)
+    print(f"  - Inline signing:  {inline_rate:,.0f} signatures/s (1 core)")
+
+    workers = os.cpu_count() or 1
+    pooled = SigningService(key, 43113, workers=workers)
+    pooled.sign_batch(transactions[:workers])  # Warm up the workers
+    start = time.perf_counter()
+    pooled.sign_batch(transactions)
+    pool_rate = count / (time.perf_counter() - start)
+    pooled.close()
+    print(f"  - Pool signing:    {pool_rate:,.0f} signatures/s ({workers} workers, {pool_rate / workers:,.0f}/core)")
+
+
+if __name__ == "__main__":
+    _benchmark()